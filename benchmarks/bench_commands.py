@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Commands per second through repl._evaluate and Game.__call__
+
+Run with `python -m benchmarks.bench_commands [N]`. A seeded game with a
+NullRenderer runs a fixed mix of moves, looks, inventory checks and bad
+input. `legacy` re-creates the original dispatch, which walked the nested
+game_data tables and called inspect.getfullargspec for every command.
+"""
+
+import sys
+from inspect import getfullargspec
+from itertools import cycle, islice
+from time import perf_counter
+from dork import repl, types
+from dork.game_utils import game_data, renderers
+# pylint: disable=protected-access
+
+
+MIX = [
+    "n", "look", "e", "i", "s", "examine", "w", "go north", "inventory",
+    "walk east", "look look", "i larsen", "dance", "", ".v", "head south",
+]
+
+
+def legacy(cmd, dork):
+    """the original _evaluate and Game.__call__"""
+
+    # pylint: disable=too-many-branches
+    errs = game_data.ERRS
+    cmd = cmd.strip().split(" ", 1)
+    if cmd[0]:
+        verb, *noun = cmd
+        noun = noun[0] if noun else None
+        call = game_data.CMDS.get(verb, game_data.MOVES.get(
+            verb, game_data.META.get(verb, errs["u"])
+        ))
+        if isinstance(call, dict):
+            method, arg = call.get(noun, errs["which way"])
+        elif call not in errs.values():
+            if verb == noun:
+                method, arg = errs["twice"]
+            elif len(call) > 1:
+                if noun:
+                    method, arg = errs["which way"]
+                else:
+                    method, arg = call
+            elif noun and len(call) == 1:
+                method, arg = call[0], noun
+            else:
+                method, arg = call[0], None
+        else:
+            method, arg = call
+    else:
+        method, arg = errs["?"]
+
+    do_func = getattr(dork, method)
+    func_args = getfullargspec(do_func).args
+    if arg:
+        if not func_args or ("self" in func_args and len(func_args) == 1):
+            return dork._repl_error("This command takes no arguments")
+        return do_func(arg)
+    return do_func()
+
+
+def rate(evaluate, game, n):
+    """commands per second for n commands from the mix"""
+
+    start = perf_counter()
+    for cmd in islice(cycle(MIX), n):
+        evaluate(cmd, game)
+    return n/(perf_counter() - start)
+
+
+def main(n=200000):
+    """print commands/second before and after the compiled dispatch"""
+
+    n = int(n)
+    game = types.Gamebuilder.build("bencher", 40, 40, seed=1)
+    game.renderer = renderers.NullRenderer()
+    print(f"{'dispatch':>10} {'commands/s':>12}")
+    for label, evaluate in [("legacy", legacy), ("compiled", repl._evaluate)]:
+        print(f"{label:>10} {rate(evaluate, game, n):>12.0f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
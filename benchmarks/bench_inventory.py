@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""Listing a room of many items, before and after paged listings
+
+Run with `python -m benchmarks.bench_inventory [N]`. A room is filled
+with N items and listed verbosely: `legacy` is the original `out +=`
+listing of every item, then the first and last pages are timed as
+rendered for the first time and again from the cache, and finally the
+whole listing in one go.
+"""
+
+import sys
+from time import perf_counter
+from dork import types
+
+
+def legacy(holder, caller, verbose):
+    """the original Holder.get_items"""
+
+    if holder.inventory:
+        out = f"\n{caller} inventory:"
+    else:
+        out = "There's nothing here."
+
+    for name, item in holder.inventory.items():
+        out += "\n    " + name
+        if verbose:
+            for key, val in types.attrs(item).items():
+                out += "\n" + " "*8 + f"{key}: {val}"
+    return out
+
+
+def timed(func, *args):
+    """seconds for one call of func(*args)"""
+
+    start = perf_counter()
+    func(*args)
+    return perf_counter() - start
+
+
+def main(n=100000):
+    """print seconds for each way of listing an n item room"""
+
+    room = types.Room()
+    for i, record in enumerate(types.ItemFactory.build_many(int(n))):
+        name = f"{record.pop('name')} {i}"
+        room.inventory[name] = types.Item.from_record(**record)
+    last = -(-len(room.inventory)//room.per_page)
+
+    rows = [("legacy", timed(legacy, room, "room", True))]
+    for page in [1, last]:
+        for label in [f"page {page}", f"page {page} cached"]:
+            rows.append((label, timed(room.get_items, "room", True, page)))
+    rows.append(("everything", timed(room.get_items, "room", True, None)))
+
+    print(f"{len(room.inventory)} items, {last} pages")
+    for label, seconds in rows:
+        print(f"{label:>18} {seconds*1000:>10.3f}ms")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Item generation throughput, before and after the compiled sampler
+
+Run with `python -m benchmarks.bench_items [N]`. `legacy` re-creates the
+original per-item `choice(choices(..., k=len))` draws for comparison;
+`build` forges items one call at a time and `build_many` in one batch.
+"""
+
+import sys
+from random import choice, choices
+from time import perf_counter
+from dork.game_utils import factory_data
+from dork.game_utils.seeding import default_rng
+from dork.types import ItemFactory
+
+
+def legacy(weights=(8, 35, 3, 7, 5, 10)):
+    """the original name and type draws, without stats"""
+
+    types = factory_data.ITEMS["types"]
+    item_type = choice(choices(
+        population=list(types.keys()), weights=weights,
+        k=len(list(types.keys()))
+    ))
+    item_name = choice(choices(
+        population=types[item_type], k=len(types[item_type])
+    ))
+
+    new_name = []
+    build = factory_data.SEQUENCE[item_type]
+    seq = choice(choices(
+        population=build["seq"], weights=build["w"], k=len(build["seq"])
+    ))
+    for lists in seq:
+        if isinstance(lists, dict):
+            this_list = lists.get(item_type, lists.get("usable", [""]))
+        else:
+            this_list = lists or [""]
+        this_word = choice(choices(population=this_list, k=len(this_list)))
+        if not this_word:
+            new_name.append(item_name)
+        elif this_word in factory_data.NAMES["suffixes"]:
+            new_name[-1] += this_word
+            item_type = f"legendary {item_name}"
+        else:
+            new_name.append(this_word)
+    return " ".join(new_name), item_type
+
+
+def rate(make, n):
+    """items per second for a callable making n items"""
+
+    start = perf_counter()
+    make(n)
+    return n/(perf_counter() - start)
+
+
+def main(n=20000):
+    """print items/second for each way of generating items"""
+
+    n = int(n)
+    sampler = ItemFactory.sampler()
+    runs = {
+        "legacy names": lambda n: [legacy() for _ in range(n)],
+        "sampler names": lambda n: sampler.sample(default_rng(), n),
+        "build": lambda n: [ItemFactory.build() for _ in range(n)],
+        "build_many": ItemFactory.build_many,
+    }
+    for label, make in runs.items():
+        print(f"{label:>14}: {rate(make, n):>12,.0f} items/s")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
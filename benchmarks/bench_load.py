@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Time to load a saved game, eagerly and lazily
+
+Run with `python -m benchmarks.bench_load [SIDE ...]`. A seeded world is
+saved in the binary format for each side and then loaded through
+`Gamebuilder.build`, building every room up front and lazily. The lazy
+figure should stay roughly flat as the world grows.
+"""
+
+import sys
+import tempfile
+from time import perf_counter
+from dork import types
+
+
+SIDES = [50, 100, 200, 400]
+
+
+def bench(side, lazy, repeat=3):
+    """best-of-repeat seconds to load the side x side world"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        types.Gamebuilder.build(f"bench{side}", options={"lazy": lazy})
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(*sides):
+    """print rooms and load seconds per world side"""
+
+    sides = [int(side) for side in sides] or SIDES
+    with tempfile.TemporaryDirectory() as directory:
+        types.Gamebuilder.save_dir = directory
+        print(f"{'side':>6} {'rooms':>8} {'eager':>8} {'lazy':>8}")
+        for side in sides:
+            game = types.Gamebuilder.build(
+                f"bench{side}", side, side, seed=side,
+                options={"save_format": "binary"}
+            )
+            game._save_game()  # pylint: disable=protected-access
+            eager, lazy = bench(side, False), bench(side, True)
+            print(
+                f"{side:>6} {len(game.rooms):>8} {eager:>8.3f} {lazy:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
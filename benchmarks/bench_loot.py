@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Looting a room of many items, before and after bulk moves
+
+Run with `python -m benchmarks.bench_loot [N]`. A room is filled with N
+items and emptied by `take`. `legacy` is the original take, which deep
+copied the room's inventory to walk its keys and moved items one by one;
+the filtered rows take every weapon and every item with luck over 10.
+"""
+
+import sys
+from copy import deepcopy
+from time import perf_counter
+from dork import types
+# pylint: disable=protected-access
+
+
+ROWS = [
+    ("legacy", "legacy"),
+    ("take", None),
+    ("take all weapon", "all weapon"),
+    ("take all luck>10", "all luck>10"),
+]
+
+
+def legacy(room, hero):
+    """the original Room._take of everything"""
+
+    out = ""
+    room_copy = deepcopy(room.inventory)
+    for item in room_copy:
+        hero.inventory[item] = room.inventory.pop(item)
+        out += f"You took {item}\n"
+    return out, False
+
+
+def fill(n):
+    """a room with n items and an empty-handed hero"""
+
+    room, hero = types.Room(), types.Player()
+    for i, record in enumerate(types.ItemFactory.build_many(n)):
+        name = f"{record.pop('name')} {i}"
+        room.inventory[name] = types.Item.from_record(**record)
+    return room, hero
+
+
+def main(n=100000):
+    """print seconds to loot an n item room each way"""
+
+    n = int(n)
+    print(f"{n} items")
+    for label, arg in ROWS:
+        room, hero = fill(n)
+        start = perf_counter()
+        if arg == "legacy":
+            legacy(room, hero)
+        else:
+            room._take(hero, arg)
+        seconds = perf_counter() - start
+        print(f"{label:>18} {seconds*1000:>10.3f}ms {len(hero.inventory):>8}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
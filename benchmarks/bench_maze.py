@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Scaling benchmark for MazeFactory.carve
+
+Run with `python -m benchmarks.bench_maze [SIDE ...]`. Each side is carved
+into a square maze and the time per cell is reported; a linear generator
+keeps that figure roughly flat as the maze grows.
+"""
+
+import sys
+from time import perf_counter
+from dork.types import MazeFactory
+
+
+SIDES = [250, 500, 1000, 2000]
+
+
+def bench(side, repeat=3):
+    """best-of-repeat seconds to carve a side x side maze"""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        MazeFactory.carve(side, side)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(*sides):
+    """print seconds and microseconds per cell for each maze side"""
+
+    sides = [int(side) for side in sides] or SIDES
+    print(f"{'side':>6} {'cells':>10} {'seconds':>9} {'us/cell':>8}")
+    for side in sides:
+        seconds = bench(side)
+        cells = (side//2)**2
+        per_cell = seconds/cells*1e6
+        print(f"{side:>6} {cells:>10} {seconds:>9.3f} {per_cell:>8.2f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Resident bytes per Item and Room against their earlier layouts
+
+Run with `python -m benchmarks.bench_memory [N]`. The "before" figures
+come from plain classes carrying the same attributes in a __dict__, which
+is how Item and Room were laid out before they were slotted, and from a
+slotted Item holding all eight fields itself, as it did before items
+shared templates.
+"""
+
+import sys
+import tracemalloc
+from dork import types
+
+
+FIELDS = types.attrs(types.Item())
+
+
+class DictItem:
+    """an Item with a __dict__"""
+
+    # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    def __init__(self):
+        for name in FIELDS:
+            setattr(self, name, None)
+
+
+class SlotItem:
+    """an Item holding every field in its own slots"""
+
+    # pylint: disable=too-few-public-methods
+    __slots__ = tuple(FIELDS)
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, None)
+
+
+class DictRoom:
+    """a Room with a __dict__"""
+
+    # pylint: disable=too-few-public-methods
+    def __init__(self):
+        for name, val in types.attrs(types.Room()).items():
+            setattr(self, name, {} if isinstance(val, dict) else None)
+
+
+def per_object(make, n):
+    """traced bytes per object for n objects built by make"""
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objs = [make() for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objs
+    return (size - 8*n)/n
+
+
+def main(n=100000):
+    """print bytes per item and room, before and after"""
+
+    n = int(n)
+    types.Room.instances.clear()
+    rows = [
+        ("item", DictItem, types.Item),
+        ("slots", SlotItem, types.Item),
+        ("room", DictRoom, types.Room),
+    ]
+    print(f"{'':>6} {'before':>8} {'after':>8}")
+    for label, old, new in rows:
+        before, after = per_object(old, n), per_object(new, n)
+        print(f"{label:>6} {before:>8.0f} {after:>8.0f}")
+        types.Room.instances.clear()
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
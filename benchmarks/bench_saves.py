@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Save and load round trips for each save format
+
+Run with `python -m benchmarks.bench_saves [SIDE ...]`. A seeded world is
+generated for each side and saved and loaded through every backend in
+`saves.BACKENDS`, reporting file size and best-of-three seconds. The
+"yaml (pure)" row is the pure-Python loader and dumper used before saves
+went through libyaml.
+"""
+
+import sys
+from time import perf_counter
+import yaml
+from dork import types
+from dork.game_utils import saves
+
+
+SIDES = [25, 50, 100]
+
+
+class PureYamlBackend(saves.YamlBackend):
+    """the YAML backend without libyaml"""
+
+    @staticmethod
+    def _loader():
+        return yaml.SafeLoader
+
+    @staticmethod
+    def _dumper():
+        return yaml.SafeDumper
+
+
+def best(func, arg, repeat=3):
+    """best-of-repeat seconds for one call of func(arg)"""
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func(arg)
+        seconds = min(seconds, perf_counter() - start)
+    return seconds
+
+
+def world(side):
+    """save data for a seeded side x side world"""
+
+    data = types.MazeFactory.build(side, side, seed=side)
+    return types.Gamebuilder.save_data(types.Gamebuilder.make_game(data))
+
+
+def main(*sides):
+    """print size, save and load seconds per backend and maze side"""
+
+    sides = [int(side) for side in sides] or SIDES
+    backends = {"yaml (pure)": PureYamlBackend()}
+    backends.update({name: saves.build(name) for name in saves.BACKENDS})
+
+    print(f"{'side':>6} {'format':>12} {'bytes':>10} {'save':>8} {'load':>8}")
+    for side in sides:
+        data = world(side)
+        for name, backend in backends.items():
+            blob = backend.dumps(data)
+            save = best(backend.dumps, data)
+            load = best(backend.loads, blob)
+            print(
+                f"{side:>6} {name:>12} {len(blob):>10} "
+                f"{save:>8.3f} {load:>8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
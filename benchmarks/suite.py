@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""Benchmark suite for world generation, saves and command dispatch
+
+Run with `python -m benchmarks.suite [SIDE ...] [--baseline FILE]`. Every
+case in `CASES` is timed on seeded side x side worlds, the seed being the
+side, as the best of a few repeats. Each run is appended to a JSON
+history file, and compared against a baseline run when one is given: any
+case which got slower by more than the threshold is reported and makes
+the suite exit with status 1. `--save-baseline` stores the run as the
+new baseline and `--plot` draws the history to an image. Nothing is ever
+shown on screen; matplotlib runs on the Agg backend.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime, timezone
+from itertools import cycle, islice
+from time import perf_counter
+from dork import repl, types
+from dork.game_utils import renderers, runner, seeding
+# pylint: disable=protected-access
+
+
+SIDES = [10, 25, 50]
+HISTORY = "./benchmarks/history.json"
+THRESHOLD = 0.25
+
+
+def _world(side):
+    """save data for the seeded side x side world"""
+
+    return types.MazeFactory.build(side, side, seed=side)
+
+
+def _game(side, name="suite"):
+    """a new headless game in the seeded side x side world"""
+
+    game = types.Gamebuilder.build(f"{name}{side}", side, side, seed=side)
+    game.renderer = renderers.NullRenderer()
+    game.interactive = False
+    return game
+
+
+def maze_build(side):
+    """MazeFactory.build, rooms and all"""
+
+    return lambda: types.MazeFactory.build(side, side, seed=side)
+
+
+def room_build(side):
+    """RoomFactory.build on an already carved maze"""
+
+    seeds = seeding.Seeds(side)
+    maze, path = types.MazeFactory.carve(
+        side + side % 2, side + side % 2, seeds.stream("maze")
+    )
+    rooms = types.MazeFactory.find_rooms(maze, path)
+    return lambda: types.RoomFactory.build(maze, rooms, seeds)
+
+
+def item_build(side):
+    """ItemFactory.build, once per room"""
+
+    count = len(_world(side)["rooms"])
+
+    def _build():
+        rng = seeding.Seeds(side).stream("loot")
+        for _ in range(count):
+            types.ItemFactory.build(rng=rng)
+    return _build
+
+
+def gamebuilder_build(side):
+    """Gamebuilder.build of a new game"""
+
+    return lambda: _game(side, "new")
+
+
+def _save(side, save_format):
+    game = _game(side)
+    game.save_format = save_format
+    return lambda: types.Gamebuilder.save_game(game)
+
+
+def _load(side, save_format):
+    game = _game(side)
+    game.save_format = save_format
+    types.Gamebuilder.save_game(game)
+    return lambda: types.Gamebuilder.load_game(game.hero.name)
+
+
+def save_yaml(side):
+    """Gamebuilder.save_game as YAML"""
+
+    return _save(side, "yaml")
+
+
+def load_yaml(side):
+    """Gamebuilder.load_game of a YAML save"""
+
+    return _load(side, "yaml")
+
+
+def save_binary(side):
+    """Gamebuilder.save_game in the binary format"""
+
+    return _save(side, "binary")
+
+
+def load_binary(side):
+    """Gamebuilder.load_game of a binary save"""
+
+    return _load(side, "binary")
+
+
+def evaluate(side, count=2000):
+    """repl._evaluate over the runner's command mix"""
+
+    game = _game(side)
+    commands = list(islice(cycle(runner.MIX), count))
+
+    def _play():
+        for cmd in commands:
+            repl._evaluate(cmd, game)
+    return _play
+
+
+def player_move(side, count=2000):
+    """Player.move back and forth through one door"""
+
+    game = _game(side)
+    hero = game.hero
+    there = next(
+        cardinal for cardinal in types.RoomFactory.moves
+        if getattr(hero.location, cardinal)
+    )
+    back = {
+        "north": "south", "south": "north", "east": "west", "west": "east"
+    }[there]
+
+    def _walk():
+        for _ in range(count//2):
+            hero.move(there, game.maze)
+            hero.move(back, game.maze)
+    return _walk
+
+
+CASES = {
+    "maze_build": maze_build,
+    "room_build": room_build,
+    "item_build": item_build,
+    "gamebuilder_build": gamebuilder_build,
+    "save_yaml": save_yaml,
+    "load_yaml": load_yaml,
+    "save_binary": save_binary,
+    "load_binary": load_binary,
+    "evaluate": evaluate,
+    "player_move": player_move,
+}
+
+
+def best(func, repeat=3):
+    """best-of-repeat seconds for one call of func()"""
+
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        seconds = min(seconds, perf_counter() - start)
+    return seconds
+
+
+def run(sides, cases=None, repeat=3):
+    """{case: {side: seconds}} for the named cases, by default all"""
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        types.Gamebuilder.save_dir = directory
+        for name in cases or CASES:
+            results[name] = {
+                str(side): best(CASES[name](side), repeat) for side in sides
+            }
+    return results
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """(case, side, ratio) for everything over threshold slower"""
+
+    slower = []
+    for name, timings in results.items():
+        for side, seconds in timings.items():
+            before = baseline.get(name, {}).get(side)
+            if before and seconds/before > 1 + threshold:
+                slower.append((name, side, seconds/before))
+    return slower
+
+
+def record(results, history):
+    """append a run to the JSON history file"""
+
+    runs = []
+    if os.path.exists(history):
+        with open(history) as stream:
+            runs = json.load(stream)
+    runs.append({
+        "when": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    })
+    with open(history, "w") as stream:
+        json.dump(runs, stream, indent=1)
+    return runs
+
+
+def plot(runs, path):
+    """draw every case's seconds per run, one line per side"""
+
+    # pylint: disable=import-outside-toplevel
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    names = sorted({name for run_ in runs for name in run_["results"]})
+    fig, axes = plt.subplots(
+        len(names), 1, figsize=(8, 2.5*len(names)), squeeze=False
+    )
+    for axis, name in zip(axes[:, 0], names):
+        sides = sorted(
+            {side for run_ in runs for side in run_["results"].get(name, {})},
+            key=int
+        )
+        for side in sides:
+            axis.plot(
+                [run_["results"].get(name, {}).get(side) for run_ in runs],
+                marker="o", label=f"side {side}"
+            )
+        axis.set_title(name)
+        axis.set_ylabel("seconds")
+        axis.legend(fontsize="small")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def main(*argv):
+    """time the cases, record them and compare with a baseline"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.suite",
+        description="Time world generation, saves and commands."
+    )
+    parser.add_argument("sides", nargs="*", type=int, default=SIDES)
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--save-baseline", default=None, metavar="FILE")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--plot", default=None, metavar="FILE")
+    opts = parser.parse_args(argv)
+
+    results = run(opts.sides, opts.cases, opts.repeat)
+    print(f"{'case':>18} {'side':>6} {'seconds':>9}")
+    for name, timings in results.items():
+        for side, seconds in timings.items():
+            print(f"{name:>18} {side:>6} {seconds:>9.4f}")
+
+    runs = record(results, opts.history)
+    if opts.plot:
+        plot(runs, opts.plot)
+    if opts.save_baseline:
+        with open(opts.save_baseline, "w") as stream:
+            json.dump(results, stream, indent=1)
+
+    if opts.baseline is None:
+        return 0
+    with open(opts.baseline) as stream:
+        slower = compare(results, json.load(stream), opts.threshold)
+    for name, side, ratio in slower:
+        print(f"slower: {name} at side {side} takes {ratio:.2f}x the baseline")
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:]))
@@ -1,15 +1,144 @@
 # -*- coding: utf-8 -*-
 """Basic CLI Dork."""
+import argparse
+import sys
+from functools import partial
 import dork.repl as repl
+from dork.game_utils import renderers, saves
+from dork.game_utils.world_pool import WorldPool
 
 
 __all__ = ["main"]
 
 
+def _size(arg):
+    """parse a WxH size such as 40x20"""
+
+    try:
+        width, height = (int(n) for n in arg.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"{arg} is not a WxH size"
+        ) from None
+    return width, height
+
+
+def _parser(script_name):
+    parser = argparse.ArgumentParser(prog=script_name, add_help=False)
+    parser.add_argument("-h", "--help", action="store_true")
+    parser.add_argument(
+        "--width", type=int, help="width of newly generated mazes"
+    )
+    parser.add_argument(
+        "--height", type=int, help="height of newly generated mazes"
+    )
+    parser.add_argument(
+        "--seed", type=int, help="seed for reproducible worlds"
+    )
+    parser.add_argument(
+        "--pool", type=int, metavar="N",
+        help="worlds to pre-generate in a background process (default 1, "
+        "or 0 with --script); 0 generates each world on the spot"
+    )
+    parser.add_argument(
+        "--pool-dir", metavar="DIR",
+        help="directory of pre-generated worlds to draw from first"
+    )
+    parser.add_argument(
+        "--renderer", choices=sorted(renderers.RENDERERS), default="mpl",
+        help="how the .m command draws the maze"
+    )
+    parser.add_argument(
+        "--viewport", type=_size, metavar="WxH",
+        help="only draw this many cells around the hero (terminal only)"
+    )
+    parser.add_argument(
+        "--save-format", choices=sorted(saves.BACKENDS), default="yaml",
+        help="file format .save writes"
+    )
+    parser.add_argument(
+        "--journal", type=int, nargs="?", const=100, metavar="N",
+        help="journal every move, take and drop, saving in full every N"
+    )
+    parser.add_argument(
+        "--lazy", action="store_true",
+        help="only build the rooms of a saved world as the hero nears them"
+    )
+    parser.add_argument(
+        "--autosave", type=int, metavar="N",
+        help="save in the background after every N moves, takes and drops"
+    )
+    parser.add_argument(
+        "--autosave-interval", type=float, metavar="SECONDS",
+        help="also save in the background once this long has passed"
+    )
+    parser.add_argument(
+        "--stats", nargs="?", const=True, metavar="FILE",
+        help="time every command for .stats, writing them to FILE at exit"
+    )
+    parser.add_argument(
+        "--profile", type=int, default=0, metavar="N",
+        help="keep cProfile captures of the N slowest commands"
+    )
+    parser.add_argument(
+        "--script", metavar="FILE",
+        help="run the commands in FILE (- for stdin) without a terminal"
+    )
+    parser.add_argument(
+        "--player", default="scripted",
+        help="whose game a script plays"
+    )
+    return parser
+
+
+def _play(opts):
+    """start the world pool, if any, and run the REPL"""
+
+    render_opts = {}
+    if opts.renderer == "terminal":
+        render_opts["viewport"] = opts.viewport
+    renderer = partial(renderers.build, opts.renderer, **render_opts)
+    world = {"width": opts.width, "height": opts.height, "seed": opts.seed}
+
+    size = opts.pool
+    if size is None:
+        size = 0 if opts.script else 1
+    pool = None
+    if size > 0 or opts.pool_dir:
+        pool = WorldPool(size, opts.pool_dir, **world).start()
+    options = {
+        "pool": pool, "save_format": opts.save_format,
+        "journal": opts.journal, "lazy": opts.lazy,
+        "autosave": opts.autosave,
+        "autosave_interval": opts.autosave_interval,
+        "stats": opts.stats, "profile": opts.profile,
+    }
+    try:
+        if opts.script:
+            _script(opts, options=options, **world)
+        else:
+            repl.repl(renderer=renderer, options=options, **world)
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+def _script(opts, **world):
+    """run a command file, or stdin, through the game"""
+
+    if opts.script == "-":
+        repl.script(sys.stdin, opts.player, **world)
+    else:
+        with open(opts.script, encoding="utf-8") as lines:
+            repl.script(lines, opts.player, **world)
+
+
 def main(*args):
     """Main CLI runner for Dork"""
     script_name = args[0] if args else '???'
-    if "-h" in args or '--help' in args:
-        print("usage:", script_name, "[-h]")
+    parser = _parser(script_name)
+    opts, _ = parser.parse_known_args(args)
+    if opts.help:
+        print(parser.format_help())
     else:
-        repl.repl()
+        _play(opts)
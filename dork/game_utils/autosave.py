@@ -0,0 +1,109 @@
+"""Background autosaves"""
+
+
+from time import monotonic
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = ["Autosave", "Writer"]
+
+
+futures = LazyModule("concurrent.futures")
+
+
+class Writer:
+    """Write saves one at a time in a worker thread
+
+    The thread is started with the first save handed to `submit`.
+    """
+
+    def __init__(self, write):
+        self.write = write
+        self.pending = None
+        self.executor = None
+
+    @property
+    def busy(self):
+        """True while a save is being written"""
+
+        return self.pending is not None and not self.pending.done()
+
+    def submit(self, data):
+        """write data in the background once the last save is written"""
+
+        self.wait()
+        if self.executor is None:
+            self.executor = futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="autosave"
+            )
+        self.pending = self.executor.submit(self.write, data)
+
+    def wait(self):
+        """block until the last save is written, raising if it failed"""
+
+        if self.pending is not None:
+            pending, self.pending = self.pending, None
+            pending.result()
+
+    def close(self):
+        """finish the last save and stop the worker"""
+
+        try:
+            self.wait()
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
+
+
+class Autosave:
+    """Save a game in a background thread as it changes
+
+    Every change is reported with `touch`. Once `every` changes have built
+    up, or `interval` seconds have passed since the last save, a snapshot
+    is taken in the calling thread and handed to `write` through a
+    `Writer`, so a prompt only ever waits for the snapshot. `snapshots` must
+    provide `touch(*rooms)` and a cheap `take()`. A save still being written
+    delays the next one rather than queueing behind it.
+    """
+
+    every = 50
+    interval = 60.0
+
+    def __init__(self, snapshots, write, every=None, interval=None):
+        self.snapshots = snapshots
+        self.writer = Writer(write)
+        if every is not None:
+            self.every = every
+        if interval is not None:
+            self.interval = interval
+        self.changes = 0
+        self.last = monotonic()
+
+    def touch(self, *rooms):
+        """note changed rooms and save if a save is due"""
+
+        self.snapshots.touch(*rooms)
+        self.changes += 1
+        due = self.changes >= self.every or \
+            monotonic() - self.last >= self.interval
+        if due and not self.writer.busy:
+            self.save()
+
+    def save(self):
+        """snapshot now and write the snapshot in the background"""
+
+        self.writer.wait()
+        self.writer.submit(self.snapshots.take())
+        self.changes = 0
+        self.last = monotonic()
+
+    def wait(self):
+        """block until the last save is written, raising if it failed"""
+
+        self.writer.wait()
+
+    def close(self):
+        """finish the last save and stop the worker"""
+
+        self.writer.close()
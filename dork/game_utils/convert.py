@@ -0,0 +1,73 @@
+"""Bulk conversion of saves between formats"""
+
+
+import os
+import sys
+from dork.game_utils import saves
+from dork.game_utils.lazy import LazyModule
+from dork.types import Gamebuilder
+
+
+__all__ = ["convert", "convert_all"]
+
+
+futures = LazyModule("concurrent.futures")
+
+
+def convert(path, save_format="binary"):
+    """rewrite one save in another format, beside the original
+
+    Saves go through `Gamebuilder.make_game` on the way, so older saves
+    with flat item records come out with shared item templates.
+    """
+
+    source = saves.build(saves.format_of(path))
+    data = source.load(path)
+    extra = {
+        key: val for key, val in data.items()
+        if key not in ("maze", "rooms", "templates")
+    }
+    extra.setdefault("header", saves.header(data, os.stat(path).st_mtime))
+    game = Gamebuilder.make_game(data)
+
+    target = saves.build(save_format)
+    new_path = os.path.splitext(path)[0] + target.suffix
+    target.dump({**Gamebuilder.save_data(game), **extra}, new_path)
+    return new_path
+
+
+def convert_all(directory, save_format="binary", source="yaml",
+                workers=None):
+    """convert every save of one format in a directory, in parallel
+
+    The directory's save index is pointed at the converted saves.
+    """
+
+    suffix = saves.BACKENDS[source].suffix
+    target = saves.build(save_format)
+    with os.scandir(directory) as entries:
+        paths = sorted(
+            entry.path for entry in entries if entry.name.endswith(suffix)
+        )
+
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        converted = list(executor.map(
+            convert, paths, [save_format]*len(paths), chunksize=8
+        ))
+
+    index = saves.SaveIndex(directory)
+    for path in converted:
+        player = os.path.splitext(os.path.basename(path))[0]
+        index.record(player, save_format, target.header(path))
+    return converted
+
+
+def main(directory="./dork/saves", save_format="binary"):
+    """convert a directory of YAML saves, by default to binary"""
+
+    for path in convert_all(directory, save_format):
+        print(path)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
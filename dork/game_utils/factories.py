@@ -0,0 +1,387 @@
+"""Generators of mazes, rooms, players and items for new worlds
+
+Every factory builds plain save data, the same nested dicts a game is
+saved as, which `Gamebuilder` then turns into game objects.
+"""
+
+
+from itertools import accumulate, permutations
+from dork.game_utils import factory_data, samplers, seeding
+from dork.game_utils.lazy import LazyModule
+# pylint: disable=protected-access
+
+
+__all__ = ["ItemFactory", "PlayerFactory", "RoomFactory", "MazeFactory"]
+
+
+# numpy is only needed for building worlds
+np = LazyModule("numpy")
+
+
+class ItemFactory:
+    """Generates a random named item with randomized stats"""
+
+    items = factory_data.ITEMS
+    names = factory_data.NAMES
+    sequence = factory_data.SEQUENCE
+
+    types = items["types"]
+    condition = items["condition"]
+    material = items["material"]
+
+    posessive = names["posessive"]
+    nonposessive = names["nonposessive"]
+    suffixes = names["suffixes"]
+    abstract = names["abstract"]
+    adjectives = names["adjectives"]
+
+    type_weights = {
+        "player": [8, 0, 0, 7, 5, 10],
+        None: [8, 35, 3, 7, 5, 10],
+    }
+    samplers = {}
+    stats = []
+
+    @staticmethod
+    def build(weights=None, rng=None, stats_rng=None):
+        """generate a random item
+
+        Names are drawn from `rng` and stats from `stats_rng`, both numpy
+        Generators which default to the shared unseeded generator.
+        """
+
+        return ItemFactory.build_many(1, weights, rng, stats_rng)[0]
+
+    @staticmethod
+    def build_many(n, weights=None, rng=None, stats_rng=None):
+        """generate n random items in one batch
+
+        Names for the whole batch come from the compiled item sampler and
+        stats are rolled as one structured array per stat type.
+        """
+
+        rng = seeding.default_rng() if rng is None else rng
+        stats_rng = rng if stats_rng is None else stats_rng
+        forged = ItemFactory.sampler(weights).sample(rng, n)
+
+        groups = {}
+        for index, (_, item_type) in enumerate(forged):
+            groups.setdefault(item_type.split()[0], []).append(index)
+
+        items = {}
+        table = ItemFactory.stat_table()
+        for stat_type in sorted(groups):
+            where = groups[stat_type]
+            rolled = table.roll(stat_type, len(where), stats_rng)
+            for index, stats in zip(where, table.records(stat_type, rolled)):
+                item_name, item_type = forged[index]
+                items[index] = ItemFactory._generate(
+                    stats, item_name, item_type
+                )
+        return [items[index] for index in range(n)]
+
+    @staticmethod
+    def sampler(weights=None):
+        """the compiled sampler for a set of type weights"""
+
+        if weights not in ItemFactory.type_weights:
+            weights = None
+        if weights not in ItemFactory.samplers:
+            ItemFactory.samplers[weights] = samplers.ItemSampler(
+                ItemFactory.type_weights[weights]
+            )
+        return ItemFactory.samplers[weights]
+
+    @staticmethod
+    def stat_table():
+        """the compiled stat table shared by every item"""
+
+        if not ItemFactory.stats:
+            ItemFactory.stats.append(samplers.StatTable())
+        return ItemFactory.stats[0]
+
+    @staticmethod
+    def _generate(stats, item_name, item_type):
+        return {
+            "name": item_name,
+            "type": item_type,
+            "description": "",
+            "stats": stats
+        }
+
+
+class PlayerFactory:
+    """Generate players for a room"""
+
+    @staticmethod
+    def build(i, room, rng=None, stats_rng=None):
+        """Make a player, give them items"""
+
+        rng = seeding.default_rng() if rng is None else rng
+
+        new_player = {
+            "name": f"player {i}",
+            "description": f"player {i} description",
+            "location": room["name"],
+            "inventory": {},
+            "equipped": []
+        }
+
+        new_items = ItemFactory.build_many(
+            rng.integers(1, 4), "player", rng, stats_rng
+        )
+        for new_item in new_items:
+            item_name = new_item.pop("name")
+            if new_item["stats"]["equipable"]:
+                new_player["equipped"].append(item_name)
+
+            new_player["inventory"][item_name] = new_item
+        return new_player
+
+
+class RoomFactory:
+    """Generate rooms for a given maze"""
+
+    #  N, S and E, W are backwards because numpy uses column-order
+    moves = {
+        "north": (1, 0), "south": (-1, 0),
+        "east": (0, 1), "west": (0, -1),
+    }
+
+    @staticmethod
+    def build(maze, rooms, seeds=None):
+        """build a room"""
+
+        RoomFactory.maze = maze
+        RoomFactory.rooms = rooms
+        RoomFactory.seeds = seeding.Seeds() if seeds is None else seeds
+        RoomFactory.worldmap = {}
+        worldmap = RoomFactory._make_rooms()
+        RoomFactory.worldmap = None
+        return worldmap
+
+    @staticmethod
+    def _make_rooms():
+        for chunk in range(0, len(RoomFactory.rooms), seeding.CHUNK):
+            RoomFactory.worldmap.update(
+                RoomFactory._make_chunk(chunk//seeding.CHUNK)
+            )
+        return RoomFactory._get_adj()
+
+    @staticmethod
+    def _make_chunk(chunk):
+        """rooms for one chunk, drawn from that chunk's own streams"""
+
+        loot = RoomFactory.seeds.stream("loot", chunk)
+        npcs = RoomFactory.seeds.stream("npcs", chunk)
+        stats = RoomFactory.seeds.stream("stats", chunk)
+
+        worldmap = {}
+        start = chunk*seeding.CHUNK
+        end = min(start + seeding.CHUNK, len(RoomFactory.rooms))
+
+        #  each room's items are the slice between its offset and the next
+        offsets = [
+            0, *accumulate(loot.integers(1, 8, size=end - start).tolist())
+        ]
+        items = ItemFactory.build_many(offsets[-1], None, loot, stats)
+        for i in range(start, end):
+            x, y = RoomFactory.rooms[i]
+            new_room = {
+                "name": f"room {i}",
+                "description": f"room {i} description",
+                "coordinates": {
+                    "x": x,
+                    "y": y,
+                },
+                "adjacent": {},
+                "corridors": {},
+                "players": {},
+                "inventory": {},
+            }
+
+            for new_item in items[offsets[i - start]:offsets[i - start + 1]]:
+                new_room["inventory"][new_item.pop("name")] = new_item
+
+            for _ in range(npcs.integers(0, 3)):
+                new_player = PlayerFactory.build(i, new_room, npcs, stats)
+                new_room["players"][new_player["name"]] = new_player
+
+            worldmap[new_room["name"]] = new_room
+
+        return worldmap
+
+    @staticmethod
+    def _get_adj():
+        """link every room to the next room in each direction
+
+        Each direction is a forward scan along the rows of a flipped or
+        transposed view of the maze, so every room's neighbor and corridor
+        length come out of a handful of whole-array operations.
+        """
+
+        maze = RoomFactory.maze
+        coords = np.array(RoomFactory.rooms).reshape(-1, 2)
+        names = list(RoomFactory.worldmap)
+        ids = np.full(maze.shape, -1, dtype=np.int64)
+        ids[coords[:, 0], coords[:, 1]] = np.arange(len(names))
+        stops = (ids >= 0) | (maze == MazeFactory.wall_color)
+
+        for direction, move in RoomFactory.moves.items():
+            neighbors, lengths = RoomFactory._scan(ids, stops, coords, move)
+            for name, neighbor, length in zip(names, neighbors, lengths):
+                room = RoomFactory.worldmap[name]
+                if neighbor < 0:
+                    room["adjacent"][direction] = None
+                    room["corridors"][direction] = None
+                else:
+                    room["adjacent"][direction] = names[neighbor]
+                    room["corridors"][direction] = length
+
+        return RoomFactory.worldmap
+
+    @staticmethod
+    def _scan(ids, stops, coords, move):
+        """each room's next room id and corridor length in one direction"""
+
+        di, dj = move
+        x, y = (coords[:, 1], coords[:, 0]) if di else coords.T
+        view_ids, view_stops = (ids.T, stops.T) if di else (ids, stops)
+        if di + dj < 0:
+            view_ids, view_stops = view_ids[:, ::-1], view_stops[:, ::-1]
+            y = view_ids.shape[1] - 1 - y
+
+        ahead = RoomFactory._next_stop(view_stops)[x, y]
+        return view_ids[x, ahead].tolist(), (ahead - y).tolist()
+
+    @staticmethod
+    def _next_stop(stops):
+        """column of the first stop strictly after each cell in its row"""
+
+        rows, cols = stops.shape
+        index = np.where(stops, np.arange(cols), cols)
+        following = np.minimum.accumulate(index[:, ::-1], axis=1)[:, ::-1]
+        return np.hstack([following[:, 1:], np.full((rows, 1), cols)])
+
+
+class MazeFactory:
+    """Generate a maze with rooms on intersections, corners, and dead-ends"""
+
+    colors = factory_data.COLORS
+    wall_color, path_color, room_color, player_color = (
+        colors["wall"], colors["path"], colors["room"], colors["player"]
+    )
+    moves = factory_data.MOVES
+    rules = factory_data.rules(wall_color, path_color)
+
+    room_codes = factory_data.room_codes(wall_color, path_color)
+    sizes = [10, 12, 14, 18]
+    orders = tuple(permutations(range(len(moves))))
+
+    @staticmethod
+    def build(width=None, height=None, seed=None):
+        """generate a maze
+
+        Without a size one of the classic small mazes is picked at random,
+        and with only one side the maze is square. Sides are rounded up to
+        the next even number so that the maze keeps its outer wall. The
+        same seed always builds the same world.
+        """
+
+        seeds = seeding.Seeds(seed)
+        rng = seeds.stream("maze")
+
+        if height is None and width is None:
+            height = MazeFactory.sizes[rng.integers(len(MazeFactory.sizes))]
+            width = 148//height
+        height = width if height is None else height
+        width = height if width is None else width
+
+        x = max(2, height + height % 2)
+        y = max(2, width + width % 2)
+
+        maze, path = MazeFactory.carve(x, y, rng)
+        rooms = MazeFactory.find_rooms(maze, path)
+        maze[rooms[0]] = MazeFactory.player_color
+
+        return {
+            "maze": maze.tolist(),
+            "rooms": RoomFactory.build(maze, rooms, seeds)
+        }
+
+    @staticmethod
+    def find_rooms(maze, cells):
+        """mark the junctions, corners and dead-ends among cells as rooms
+
+        Every cell's four neighbors are packed into a 4-bit code with shifted
+        slices of the whole maze and looked up in `room_codes`, so there is
+        no per-cell Python work. Rooms keep the order of `cells` and are
+        returned as a list of (x, y) tuples.
+        """
+
+        is_path = (maze == MazeFactory.path_color).astype(np.uint8)
+        codes = (
+            is_path[:-2, 1:-1] << 3 | is_path[2:, 1:-1] << 2 |
+            is_path[1:-1, :-2] << 1 | is_path[1:-1, 2:]
+        )
+        is_room = np.array(MazeFactory.room_codes)[codes]
+
+        rooms = cells[is_room[cells[:, 0] - 1, cells[:, 1] - 1]]
+        maze[rooms[:, 0], rooms[:, 1]] = MazeFactory.room_color
+        return list(map(tuple, rooms.tolist()))
+
+    # pylint: disable=too-many-locals
+    @staticmethod
+    def carve(x, y, rng=None):
+        """carve a perfect maze into an (x+1, y+1) array of walls
+
+        Cells sit on odd coordinates and are carved by an iterative
+        backtracker over a boolean visited array, so time and memory are
+        linear in the number of cells. Each cell gets one random ordering of
+        the four moves up front instead of a shuffle per step. Returns the
+        maze and an (n, 2) array of the carved cells in the order they were
+        reached.
+        """
+
+        rng = np.random.default_rng() if rng is None else rng
+        rows, cols = x//2, y//2
+        cells = rows*cols
+        steps = [
+            (di//2)*cols + dj//2 for (di, dj), _ in MazeFactory.moves
+        ]
+        across = [di == 0 for (di, _), _ in MazeFactory.moves]
+
+        visited = np.zeros(cells, dtype=bool)
+        seen = memoryview(visited)
+        orders = rng.integers(0, len(MazeFactory.orders), size=cells).tolist()
+
+        start = int(rng.integers(cells))
+        seen[start] = True
+        stack, carved, headings = [start], [start], [0]
+
+        while stack:
+            cell = stack[-1]
+            for move in MazeFactory.orders[orders[cell]]:
+                probe = cell + steps[move]
+                if 0 <= probe < cells and not seen[probe] and (
+                        not across[move] or probe//cols == cell//cols):
+                    seen[probe] = True
+                    stack.append(probe)
+                    carved.append(probe)
+                    headings.append(move)
+                    break
+            else:
+                stack.pop()
+
+        maze = np.full((x+1, y+1), MazeFactory.wall_color)
+        i, j = np.divmod(np.array(carved), cols)
+        i, j = 2*i + 1, 2*j + 1
+        maze[i, j] = MazeFactory.path_color
+
+        between = np.array([wall for _, wall in MazeFactory.moves])
+        headings = np.array(headings[1:], dtype=int)
+        maze[
+            i[1:] - between[headings, 0], j[1:] - between[headings, 1]
+        ] = MazeFactory.path_color
+
+        return maze, np.stack([i, j], axis=1)
@@ -1,7 +1,7 @@
 """data for factories"""
 
 
-from random import randint
+from dork.game_utils.seeding import default_rng
 
 
 ITEMS = {
@@ -524,6 +524,37 @@ SEQUENCE = {
     }
 }
 
+COLORS = {
+    "wall": -2,
+    "path": 2,
+    "room": 1,
+    "player": 0,
+}
+
+#  inclusive (low, high) tuples are rolled, anything else is a fixed value
+STAT_DEFAULTS = {
+    "attack": None,
+    "amount": 1,
+    "strength": None,
+    "weight": 0,
+    "luck": (-10, 10),
+    "equipable": True,
+}
+
+STATS = {
+    "weapon": {"attack": (10, 30), "weight": (5, 20)},
+    "armor": {"strength": (10, 30), "weight": (15, 40)},
+    "jewelry": {"strength": (-1, 10), "luck": (-4, 4)},
+    "filler": {"weight": (5, 25), "luck": (-50, 0), "equipable": False},
+    "magic": {
+        "attack": (15, 50),
+        "amount": (3, 12),
+        "strength": (5, 15),
+        "weight": (2, 7),
+    },
+    "legendary": {"attack": (60, 120), "weight": (5, 15), "luck": (20, 80)},
+}
+
 MOVES = [
     [(0, 2), (0, 1)], [(0, -2), (0, -1)],
     [(2, 0), (1, 0)], [(-2, 0), (-1, 0)]
@@ -550,50 +581,30 @@ def rules(wall, path):
     ]
 
 
-def stats(item_type):
-    """item type-specific stats"""
-
-    item_type = item_type.split()[0]
-
-    attack = {
-        "weapon": randint(10, 30),
-        "magic": randint(15, 50),
-        "legendary": randint(60, 120),
-    }.get(item_type, None)
+def room_codes(wall, path):
+    """lookup table of which 4-bit neighbor codes make a room
 
-    amount = {
-        "magic": randint(3, 12)
-    }.get(item_type, 1)
+    A cell's code sets one bit per path neighbor, in the same order the
+    neighbors appear in `rules`, from the high bit down.
+    """
 
-    strength = {
-        "armor": randint(10, 30),
-        "jewelry": randint(-1, 10),
-        "magic": randint(5, 15),
-    }.get(item_type, None)
+    codes = {
+        sum(1 << (3 - i) for i, cell in enumerate(rule) if cell == path)
+        for rule in rules(wall, path)
+    }
+    return [code in codes for code in range(16)]
 
-    weight = {
-        "weapon": randint(5, 20),
-        "armor": randint(15, 40),
-        "filler": randint(5, 25),
-        "magic": randint(2, 7),
-        "legendary": randint(5, 15),
-    }.get(item_type, 0)
 
-    luck = {
-        "jewelry": randint(-4, 4),
-        "filler": randint(-50, 0),
-        "legendary": randint(20, 80)
-    }.get(item_type, randint(-10, 10))
+def stats(item_type, rng=None):
+    """item type-specific stats, drawn from the numpy Generator rng"""
 
-    equipable = {
-        "filler": False
-    }.get(item_type, True)
+    rng = default_rng() if rng is None else rng
+    stat_rules = STATS.get(item_type.split()[0], {})
 
-    return {
-        "attack": attack,
-        "amount": amount,
-        "strength": strength,
-        "weight": weight,
-        "luck": luck,
-        "equipable": equipable
-    }
+    out = {}
+    for field, default in STAT_DEFAULTS.items():
+        rule = stat_rules.get(field, default)
+        if isinstance(rule, tuple):
+            rule = int(rng.integers(rule[0], rule[1] + 1))
+        out[field] = rule
+    return out
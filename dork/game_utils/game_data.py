@@ -1,7 +1,7 @@
 """Data and commands for REPL"""
 
 
-__all__ = ["CMDS", "MOVES", "ERRS", "META", "TITLE"]
+__all__ = ["CMDS", "MOVES", "ERRS", "META", "TITLE", "JOURNALED"]
 
 
 TITLE = r"""Welcome to...
@@ -56,6 +56,8 @@ META = {
     ".new": ["_start_over"],
     ".load": ["_start_over"],
     ".save": ["_save_game"],
+    ".saves": ["_list_saves"],
+    ".stats": ["_show_stats"],
     ".rq": ["_gtfo"],
     ".z": ["_zork"],
     ".m": ["_draw_maze"],
@@ -63,9 +65,14 @@ META = {
 }
 
 
+#  Game methods which change the world, and so are written to the journal
+JOURNALED = ("_move", "_take_item", "_drop_item")
+
+
 ERRS = {
     "u": ["_repl_error", "Sorry, I don't know that one."],
     "?": ["_repl_error", "Huh? Can you speak up?"],
     "which way": ["_repl_error", "Um. Where are you trying to go?"],
-    "twice": ["_repl_error", "A command so nice you said it twice!\n...idiot"]
+    "twice": ["_repl_error", "A command so nice you said it twice!\n...idiot"],
+    "no args": ["_repl_error", "This command takes no arguments"],
 }
@@ -0,0 +1,92 @@
+"""Inventories of items, and filters for picking items out of them"""
+
+
+import operator
+import re
+from dork.game_utils.factory_data import STAT_DEFAULTS
+
+
+__all__ = ["Inventory", "selector"]
+
+
+class Inventory(dict):
+    """The items of a holder, counting every change made to them
+
+    Listings of a holder's items are cached against `version`, so
+    inventories must only be changed through the dict methods.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.version += 1
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def clear(self):
+        super().clear()
+        self.version += 1
+
+
+_FILTER = re.compile(r"(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(-?\d+)")
+_COMPARE = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "=": operator.eq, "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+def selector(spec):
+    """a test for items of a type, like "weapon", or stat, like "luck>10"
+
+    Types also match on any one of their words, so "magic" picks both
+    kinds of magic item. Type tests are worked out once per template.
+    """
+
+    match = _FILTER.fullmatch(spec)
+    if match and match[1] in STAT_DEFAULTS:
+        field, compare, bound = match[1], _COMPARE[match[2]], int(match[3])
+
+        def _keep(item):
+            val = item.template.value(item.deltas, field)
+            return val is not None and compare(val, bound)
+        return _keep
+
+    kinds = {}
+
+    def _keep_kind(item):
+        template = item.template
+        kind = kinds.get(template)
+        if kind is None:
+            kind = kinds[template] = (
+                spec == template.type or spec in str(template.type).split()
+            )
+        return kind
+    return _keep_kind
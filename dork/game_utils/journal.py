@@ -0,0 +1,79 @@
+"""Append-only journal of the commands which change a game"""
+
+
+import json
+import os
+
+
+__all__ = ["Journal"]
+
+
+class Journal:
+    """A per-player log of state-changing commands
+
+    Every journaled command is appended as one numbered JSON line, so
+    progress survives a crash of the game at the cost of a small synced
+    write per command. After `every` commands the game is saved in full and
+    the journal is emptied. Saves record the number of the last command they
+    include, so lines left behind by a crash between the two are skipped
+    when the journal is replayed on top of the save.
+    """
+
+    def __init__(self, path, every=100):
+        self.path = path
+        self.every = every
+        self.seq = 0
+        self.pending = 0
+
+    @property
+    def due(self):
+        """True once enough commands have built up to save in full"""
+
+        return self.pending >= self.every
+
+    @property
+    def empty(self):
+        """True if there is nothing in the journal, not even a torn line"""
+
+        try:
+            return os.path.getsize(self.path) == 0
+        except FileNotFoundError:
+            return True
+
+    def append(self, cmd, arg):
+        """write one command to the end of the journal and sync it to disk"""
+
+        self.seq += 1
+        self.pending += 1
+        with open(self.path, "a", encoding="utf-8") as journal:
+            journal.write(json.dumps([self.seq, cmd, arg]) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def read(self, after=0):
+        """(seq, cmd, arg) for every whole entry numbered above after
+
+        Reading stops at the first line which does not parse, which is
+        where a crash cut the journal short.
+        """
+
+        entries = []
+        try:
+            with open(self.path, encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        seq, cmd, arg = json.loads(line)
+                    except ValueError:
+                        break
+                    if seq > after:
+                        entries.append((seq, cmd, arg))
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def reset(self):
+        """empty the journal once a save covers everything in it"""
+
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        self.pending = 0
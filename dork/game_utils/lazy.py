@@ -0,0 +1,34 @@
+"""Deferred imports for heavy third-party modules"""
+
+
+from importlib import import_module
+
+
+__all__ = ["LazyModule"]
+
+
+class LazyModule:
+    """A module proxy which imports its target on first attribute access
+
+    Used for matplotlib, numpy and yaml so that starting the REPL does not
+    pay for plotting, array or YAML support until a command needs them.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self):
+        """True once the target module has actually been imported"""
+
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
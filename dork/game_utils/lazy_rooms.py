@@ -0,0 +1,48 @@
+"""A worldmap whose rooms are built as they are needed"""
+
+
+from collections.abc import Mapping
+
+
+__all__ = ["LazyRooms", "CARDINALS"]
+
+
+CARDINALS = ("north", "south", "east", "west")
+
+
+class LazyRooms(Mapping):
+    """A worldmap which builds each room the first time it is looked up"""
+
+    def __init__(self, records, templates, build, players=None):
+        self.records = records
+        self.templates = templates
+        self.build = build
+        self.players = {} if players is None else players
+        self.built = {}
+
+    def __getitem__(self, name):
+        room = self.built.get(name)
+        if room is None:
+            room = self.build(self.templates, self.records[name])
+            for player in room.players.values():
+                player.location = room
+                self.players[player.name] = player
+            self.built[name] = room
+        return room
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __contains__(self, name):
+        return name in self.records
+
+    def link(self, room):
+        """swap a room's neighbouring room names for built rooms"""
+
+        for cardinal in CARDINALS:
+            adjacent = getattr(room, cardinal)
+            if isinstance(adjacent, str):
+                setattr(room, cardinal, self[adjacent])
@@ -0,0 +1,293 @@
+"""Maze renderers for the Dork game"""
+
+
+import shutil
+import sys
+from abc import ABC, abstractmethod
+from time import monotonic
+from dork.game_utils.factory_data import COLORS
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = [
+    "Renderer", "NullRenderer", "MatplotlibRenderer", "TerminalRenderer",
+    "RENDERERS", "build"
+]
+
+
+np = LazyModule("numpy")
+plt = LazyModule("matplotlib.pyplot")
+
+
+class Renderer(ABC):
+    """Common interface for maze renderers
+
+    A renderer draws the whole maze once with `draw` and is then told about
+    the cells that changed after every move with `update`. Cells are (x, y)
+    indices into the maze and `hero` is the hero's current cell.
+    """
+
+    def __init__(self):
+        self.drawn = False
+
+    @abstractmethod
+    def draw(self, maze, hero):
+        """display the maze"""
+
+    @abstractmethod
+    def update(self, maze, cells, hero):
+        """repaint the cells which changed since the last update"""
+
+    def close(self):
+        """release whatever the renderer holds on to"""
+
+        self.drawn = False
+
+
+class NullRenderer(Renderer):
+    """A renderer which draws nothing, for headless games"""
+
+    def draw(self, maze, hero):
+        self.drawn = True
+
+    def update(self, maze, cells, hero):
+        return None
+
+
+class MatplotlibRenderer(Renderer):
+    """Draw the maze in a matplotlib figure
+
+    The figure holds a single animated QuadMesh for the life of the game.
+    Moves only write their changed cells into its colour array and blit the
+    mesh over a cached background, and moves which arrive faster than one
+    per `interval` seconds are coalesced into a single redraw.
+    """
+
+    cmap = "tab20b"
+    interval = 1/30
+    max_inches = 12
+
+    def __init__(self, interval=None):
+        super().__init__()
+        if interval is not None:
+            self.interval = interval
+        self.mesh = None
+        self.colors = None
+        self.background = None
+        self.timer = None
+        self.last_frame = 0.0
+
+    @property
+    def figure(self):
+        """the figure the maze is drawn in, if any"""
+
+        return None if self.mesh is None else self.mesh.figure
+
+    @property
+    def axes(self):
+        """the axes holding the maze's mesh, if any"""
+
+        return None if self.mesh is None else self.mesh.axes
+
+    def draw(self, maze, hero):
+        self.colors = np.array(maze)
+        if self.figure is None or not plt.fignum_exists(self.figure.number):
+            self._new_figure()
+        else:
+            self.mesh.set_array(self.colors)
+        self.drawn = True
+        self.figure.canvas.draw()
+        plt.show()
+
+    def update(self, maze, cells, hero):
+        if not self.drawn:
+            return
+        if not plt.fignum_exists(self.figure.number):
+            self.drawn = False
+            return
+
+        for x, y in cells:
+            self.colors[x, y] = maze[x][y]
+        self.mesh.set_array(self.colors)
+
+        if monotonic() - self.last_frame < self.interval:
+            self._schedule()
+        else:
+            self._redraw()
+
+    def close(self):
+        if self.figure is not None:
+            plt.close(self.figure)
+        self.mesh = self.background = None
+        self.timer = None
+        super().close()
+
+    def _new_figure(self):
+        rows, cols = self.colors.shape
+        colors = COLORS.values()
+        scale = min(0.5, self.max_inches/max(rows, cols))
+        figure, axes = plt.subplots(
+            figsize=(max(1, cols*scale), max(1, rows*scale))
+        )
+        self.mesh = axes.pcolormesh(
+            self.colors, cmap=plt.get_cmap(self.cmap),
+            vmin=min(colors), vmax=max(colors), animated=True
+        )
+        axes.set_aspect("equal")
+        axes.axis("off")
+        figure.canvas.mpl_connect("draw_event", self._on_draw)
+        plt.ion()
+
+    def _on_draw(self, _):
+        """cache everything but the mesh, then paint the mesh on top"""
+
+        canvas = self.figure.canvas
+        if getattr(canvas, "supports_blit", False):
+            self.background = canvas.copy_from_bbox(self.figure.bbox)
+        self.axes.draw_artist(self.mesh)
+
+    def _schedule(self):
+        """redraw once the current frame interval has passed"""
+
+        if self.timer is None:
+            self.timer = self.figure.canvas.new_timer(
+                interval=int(self.interval*1000)
+            )
+            self.timer.single_shot = True
+            self.timer.add_callback(self._redraw)
+        self.timer.start()
+
+    def _redraw(self):
+        if self.figure is None:
+            return
+
+        canvas = self.figure.canvas
+        if self.background is not None:
+            canvas.restore_region(self.background)
+            self.axes.draw_artist(self.mesh)
+            canvas.blit(self.figure.bbox)
+        else:
+            canvas.draw_idle()
+        canvas.flush_events()
+        self.last_frame = monotonic()
+
+
+class TerminalRenderer(Renderer):
+    """Draw the maze with ANSI escape codes
+
+    The maze is painted once at the top of the screen and the rest of the
+    terminal is turned into a scrolling region for the REPL, so that each
+    move only repaints its dirty cells through cursor addressing. With a
+    `viewport` of (columns, rows) only the window around the hero is shown,
+    and the window is re-centred when the hero walks off its edge.
+    """
+
+    glyphs = {
+        COLORS["wall"]: "\x1b[47m  \x1b[0m",
+        COLORS["path"]: "  ",
+        COLORS["room"]: "\x1b[44m  \x1b[0m",
+        COLORS["player"]: "\x1b[41m@@\x1b[0m",
+    }
+
+    def __init__(self, stream=None, viewport=None):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.stdout
+        self.viewport = viewport
+        self.window = (0, 0, 0, 0)
+
+    def draw(self, maze, hero):
+        self.stream.write("\x1b[2J" + self._paint(maze, hero))
+        self.drawn = True
+        self.stream.flush()
+
+    def update(self, maze, cells, hero):
+        if not self.drawn:
+            return
+
+        if self._off_centre(maze, hero):
+            out = self._paint(maze, hero)
+        else:
+            out = "\x1b7"
+            for x, y in cells:
+                if self._visible((x, y)):
+                    out += self._goto((x, y)) + self.glyphs[maze[x][y]]
+            out += "\x1b8"
+        self.stream.write(out)
+        self.stream.flush()
+
+    def close(self):
+        if self.drawn:
+            self.stream.write("\x1b[r")
+            self.stream.flush()
+        super().close()
+
+    def _paint(self, maze, hero):
+        """paint every cell in the window around the hero"""
+
+        self.window = self._frame(maze, hero)
+        top, left, height, width = self.window
+        rows = []
+        for i in range(top, top + height):
+            row = maze[i][left:left + width]
+            rows.append(
+                self._goto((i, left)) + "".join(self.glyphs[c] for c in row)
+            )
+
+        lines = shutil.get_terminal_size().lines
+        if lines > height + 2:
+            rows.append(f"\x1b[{height + 2};{lines}r")
+        rows.append(f"\x1b[{height + 2};1H")
+        return "".join(rows)
+
+    def _frame(self, maze, hero):
+        """the (top, left, height, width) window to show"""
+
+        rows, cols = len(maze), len(maze[0])
+        if self.viewport is None:
+            return 0, 0, rows, cols
+
+        width = min(self.viewport[0], cols)
+        height = min(self.viewport[1], rows)
+        top = min(max(hero[0] - height//2, 0), rows - height)
+        left = min(max(hero[1] - width//2, 0), cols - width)
+        return top, left, height, width
+
+    def _visible(self, cell):
+        top, left, height, width = self.window
+        return top <= cell[0] < top + height and left <= cell[1] < left + width
+
+    def _off_centre(self, maze, hero):
+        """True when the hero has reached an edge the window can move past"""
+
+        if self.viewport is None:
+            return False
+
+        top, left, height, width = self.window
+        x, y = hero
+        return (
+            x <= top and top > 0 or
+            x >= top + height - 1 and top + height < len(maze) or
+            y <= left and left > 0 or
+            y >= left + width - 1 and left + width < len(maze[0])
+        )
+
+    def _goto(self, cell):
+        """cursor address for a cell, with north at the top of the screen"""
+
+        top, left, height, _ = self.window
+        row = top + height - cell[0]
+        col = 2*(cell[1] - left) + 1
+        return f"\x1b[{row};{col}H"
+
+
+RENDERERS = {
+    "mpl": MatplotlibRenderer,
+    "terminal": TerminalRenderer,
+    "none": NullRenderer,
+}
+
+
+def build(name="mpl", **kwargs):
+    """make a renderer by name"""
+
+    return RENDERERS[name](**kwargs)
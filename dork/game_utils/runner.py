@@ -0,0 +1,194 @@
+"""Headless game sessions in parallel, for throughput testing
+
+Run with `python -m dork.game_utils.runner [-n SESSIONS] [-w WORKERS]`.
+Every session builds its own seeded world through `Gamebuilder.build`
+and plays a scripted or random stream of commands through
+`repl._evaluate`, the same dispatch path as typed input. Sessions run
+in a process pool whose workers are reused, so anything an earlier
+session leaves reachable carries over to the next one in a worker; each
+session reports how many players and rooms from earlier sessions were
+still alive when it started, counted through `Player.instances` and
+`Room.instances` after a garbage collection.
+"""
+
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+from functools import partial
+from time import perf_counter, perf_counter_ns
+from dork import repl
+from dork.game_utils import renderers
+from dork.game_utils.lazy import LazyModule
+from dork.types import Gamebuilder, Player, Room
+# pylint: disable=protected-access
+
+
+__all__ = ["MIX", "session", "run", "report", "main"]
+
+
+np = LazyModule("numpy")
+futures = LazyModule("concurrent.futures")
+
+MIX = (
+    "north", "south", "east", "west", "take", "drop", "look", "inventory",
+    "examine",
+)
+PERCENTILES = (50, 90, 99)
+
+
+def _start_worker(directory):
+    """keep each worker's saves and save index out of ./dork/saves"""
+
+    Gamebuilder.save_dir = directory
+
+
+def session(seed, commands=200, script=None, width=None, height=None):
+    """play one seeded game to the end of its command stream
+
+    Without a script the stream is `commands` commands drawn from `MIX`
+    with the session's seed. A session stops early at `.rq` or `.new`.
+    """
+
+    # pylint: disable=too-many-locals
+    gc.collect()
+    stale = len(Player.instances), len(Room.instances)
+    started = perf_counter()
+    game = Gamebuilder.build(f"runner{seed}", width, height, seed=seed)
+    game.renderer = renderers.NullRenderer()
+    game.interactive = False
+    built = perf_counter()
+
+    if script is None:
+        picks = np.random.default_rng(seed).integers(len(MIX), size=commands)
+        script = [MIX[pick] for pick in picks]
+    latencies = []
+    for line in script:
+        tick = perf_counter_ns()
+        output, should_exit = repl._evaluate(line, game)
+        latencies.append(perf_counter_ns() - tick)
+        if should_exit or output == "new game":
+            break
+    finished = perf_counter()
+
+    hero = game.hero
+    crossed = game.rooms.get(hero.location.name) is not hero.location
+    game.close()
+    return {
+        "seed": seed,
+        "pid": os.getpid(),
+        "build": built - started,
+        "play": finished - built,
+        "latencies": latencies,
+        "stale players": stale[0],
+        "stale rooms": stale[1],
+        "crossed": crossed,
+    }
+
+
+def _summarize(sessions, seconds):
+    """throughput, latency percentiles and interference over sessions"""
+
+    latencies = np.concatenate([
+        np.asarray(result["latencies"], dtype=np.int64)
+        for result in sessions
+    ])
+    percentiles = np.percentile(latencies, PERCENTILES) / 1000
+    return {
+        "sessions": len(sessions),
+        "commands": len(latencies),
+        "workers": len({result["pid"] for result in sessions}),
+        "seconds": seconds,
+        "sessions/s": len(sessions)/seconds,
+        "commands/s": len(latencies)/seconds,
+        "build": np.mean([result["build"] for result in sessions]),
+        "latency us": {
+            **{
+                f"p{pct}": float(val)
+                for pct, val in zip(PERCENTILES, percentiles)
+            },
+            "max": float(latencies.max())/1000,
+        },
+        "stale players": max(result["stale players"] for result in sessions),
+        "stale rooms": max(result["stale rooms"] for result in sessions),
+        "crossed": sum(result["crossed"] for result in sessions),
+    }
+
+
+def run(sessions=8, workers=None, commands=200, script=None, width=None,
+        height=None, seed=0):
+    """play `sessions` games with seeds from `seed` on, across processes"""
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    play = partial(
+        session, commands=commands, script=script, width=width,
+        height=height
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        with futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_start_worker,
+                initargs=(directory,)) as executor:
+            started = perf_counter()
+            results = list(executor.map(play, range(seed, seed + sessions)))
+            seconds = perf_counter() - started
+    return _summarize(results, seconds)
+
+
+def report(summary):
+    """lines describing a run"""
+
+    latency = ", ".join(
+        f"{key} {val:.1f}" for key, val in summary["latency us"].items()
+    )
+    return [
+        f"{summary['sessions']} sessions, {summary['commands']} commands "
+        f"on {summary['workers']} workers in {summary['seconds']:.3f}s",
+        f"{summary['sessions/s']:.1f} sessions/s, "
+        f"{summary['commands/s']:.0f} commands/s, "
+        f"{summary['build']*1000:.1f}ms to build a world",
+        f"latency us: {latency}",
+        f"left over from earlier sessions: up to "
+        f"{summary['stale players']} players and "
+        f"{summary['stale rooms']} rooms, "
+        f"{summary['crossed']} heroes outside their own world",
+    ]
+
+
+def main(*argv):
+    """run sessions from the command line and print the report"""
+
+    parser = argparse.ArgumentParser(
+        prog="python -m dork.game_utils.runner",
+        description="Play headless games in parallel and time them."
+    )
+    parser.add_argument("-n", "--sessions", type=int, default=8)
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-c", "--commands", type=int, default=200)
+    parser.add_argument(
+        "--script", type=argparse.FileType("r"), default=None,
+        help="play these commands instead of a random stream"
+    )
+    parser.add_argument("--width", type=int, default=None)
+    parser.add_argument("--height", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    opts = parser.parse_args(argv)
+
+    script = None
+    if opts.script is not None:
+        with opts.script:
+            script = [
+                str.casefold(line.rstrip("\n")) for line in opts.script
+                if not line.lstrip().startswith("#")
+            ]
+    summary = run(
+        opts.sessions, opts.workers, opts.commands, script, opts.width,
+        opts.height, opts.seed
+    )
+    for line in report(summary):
+        print(line)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,173 @@
+"""Compiled samplers for item generation"""
+
+
+from dork.game_utils import factory_data
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = ["ItemSampler", "StatTable"]
+
+
+np = LazyModule("numpy")
+
+
+def _table(weights):
+    """integer cumulative weights, for exact weighted draws"""
+
+    return np.cumsum(np.asarray(weights, dtype=np.int64))
+
+
+def _draw(rng, table, size):
+    """indices drawn from a cumulative weight table"""
+
+    return np.searchsorted(table, rng.integers(table[-1], size=size), "right")
+
+
+class ItemSampler:
+    """Item names and types drawn from tables compiled once
+
+    `factory_data.ITEMS`, `NAMES` and `SEQUENCE` are flattened into integer
+    cumulative weight tables for item types and name sequences, and every
+    slot of every sequence is resolved to its word list up front. Drawing n
+    items is then a few array draws per (type, sequence) group followed by
+    joining the words, and follows exactly the same distribution as
+    drawing one weighted choice at a time.
+    """
+
+    def __init__(self, weights):
+        items = factory_data.ITEMS
+        self.types = list(items["types"])
+        self.type_table = _table(weights)
+        self.bases = [items["types"][name] for name in self.types]
+        self.sequences = [
+            self._compile(name, factory_data.SEQUENCE[name])
+            for name in self.types
+        ]
+
+    @staticmethod
+    def _compile(item_type, build):
+        """resolve every slot of a type's name sequences to a word list"""
+
+        suffixes = set(factory_data.NAMES["suffixes"])
+        sequences = []
+        for seq in build["seq"]:
+            slots = []
+            for lists in seq:
+                if isinstance(lists, dict):
+                    words = lists.get(item_type, lists.get("usable", [""]))
+                else:
+                    words = lists or [""]
+                slots.append((words, [word in suffixes for word in words]))
+            sequences.append(slots)
+        return sequences, _table(build["w"])
+
+    def sample(self, rng, n):
+        """n (name, type) pairs"""
+
+        out = [None]*n
+        type_ids = _draw(rng, self.type_table, n)
+        for type_id in np.unique(type_ids).tolist():
+            where = np.flatnonzero(type_ids == type_id)
+            items = self._sample_type(rng, type_id, len(where))
+            for index, item in zip(where.tolist(), items):
+                out[index] = item
+        return out
+
+    def _sample_type(self, rng, type_id, n):
+        """n (name, type) pairs of one item type"""
+
+        bases = self.bases[type_id]
+        sequences, seq_table = self.sequences[type_id]
+        base_ids = rng.integers(len(bases), size=n)
+        seq_ids = _draw(rng, seq_table, n)
+
+        out = [None]*n
+        for seq_id in np.unique(seq_ids).tolist():
+            chosen = seq_ids == seq_id
+            forged = self._forge(
+                rng, sequences[seq_id],
+                [bases[i] for i in base_ids[chosen].tolist()],
+                self.types[type_id]
+            )
+            for index, item in zip(np.flatnonzero(chosen).tolist(), forged):
+                out[index] = item
+        return out
+
+    @staticmethod
+    def _forge(rng, slots, bases, item_type):
+        """assemble the names for one (type, sequence) group"""
+
+        picks = [
+            rng.integers(len(words), size=len(bases)).tolist()
+            for words, _ in slots
+        ]
+
+        forged = []
+        for row, base in enumerate(bases):
+            new_name = []
+            this_type = item_type
+            for (words, suffix), pick in zip(slots, picks):
+                word = words[pick[row]]
+                if not word:
+                    new_name.append(base)
+                elif suffix[pick[row]]:
+                    new_name[-1] += word
+                    this_type = f"legendary {base}"
+                else:
+                    new_name.append(word)
+            forged.append((" ".join(new_name), this_type))
+        return forged
+
+
+class StatTable:
+    """Item stats rolled in bulk from `factory_data.STATS`
+
+    Each type's rules are compiled once into the fields it rolls, the
+    fields it fixes and the fields it leaves out, so rolling n items of a
+    type draws one array per rolled field and nothing else.
+    """
+
+    fields = tuple(factory_data.STAT_DEFAULTS)
+
+    def __init__(self):
+        self.dtype = np.dtype([
+            (field, bool if field == "equipable" else np.int32)
+            for field in self.fields
+        ])
+        self.rules = {}
+
+    def _compile(self, stat_type):
+        rules = factory_data.STATS.get(stat_type, {})
+        rolled, fixed, absent = [], [], []
+        for field, default in factory_data.STAT_DEFAULTS.items():
+            rule = rules.get(field, default)
+            if isinstance(rule, tuple):
+                rolled.append((field, rule[0], rule[1] + 1))
+            elif rule is None:
+                absent.append(field)
+            else:
+                fixed.append((field, rule))
+        self.rules[stat_type] = rolled, fixed, absent
+        return self.rules[stat_type]
+
+    def roll(self, stat_type, n, rng):
+        """a structured array of stats for n items of one stat type"""
+
+        rolled, fixed, _ = self.rules.get(stat_type) or self._compile(
+            stat_type
+        )
+        out = np.zeros(n, dtype=self.dtype)
+        for field, low, high in rolled:
+            out[field] = rng.integers(low, high, size=n)
+        for field, value in fixed:
+            out[field] = value
+        return out
+
+    def records(self, stat_type, stats):
+        """stats dicts for a rolled array, with unused fields as None"""
+
+        _, _, absent = self.rules.get(stat_type) or self._compile(stat_type)
+        blank = dict.fromkeys(absent)
+        return [
+            {**dict(zip(self.fields, row)), **blank} for row in stats.tolist()
+        ]
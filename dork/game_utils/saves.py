@@ -0,0 +1,497 @@
+"""Save file formats for the Dork game"""
+
+
+import io
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from contextlib import closing
+from dork.game_utils.factory_data import STAT_DEFAULTS
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = [
+    "SaveBackend", "YamlBackend", "BinaryBackend", "RoomRecords",
+    "SaveIndex", "BACKENDS", "build", "format_of", "header", "write_atomic"
+]
+
+
+np = LazyModule("numpy")
+sqlite3 = LazyModule("sqlite3")
+yaml = LazyModule("yaml")
+
+CARDINALS = ("north", "south", "east", "west")
+FIELDS = tuple(STAT_DEFAULTS)
+
+#  marks a stat which an item does not store, as its template fixes it
+ABSENT = -2**31
+#  marks a corridor with no entry at all, as opposed to a None entry
+MISSING = -2
+
+
+def write_atomic(path, blob):
+    """write bytes to path so that readers never see half a file"""
+
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as save_file:
+        save_file.write(blob)
+    os.replace(tmp, path)
+
+
+def _pack_strings(strings):
+    """utf-8 bytes of NUL-separated strings, for a compact string column"""
+
+    return np.frombuffer("\0".join(strings).encode(), dtype=np.uint8)
+
+
+def _unpack_strings(column, count):
+    if not count:
+        return []
+    return column.tobytes().decode().split("\0")
+
+
+def header(data, last_played=None):
+    """the summary of a save kept in its header and in the save index"""
+
+    maze = data["maze"]
+    return {
+        "width": len(maze[0]) if maze else 0,
+        "height": len(maze),
+        "rooms": len(data["rooms"]),
+        "last_played": time.time() if last_played is None else last_played,
+    }
+
+
+class SaveBackend(ABC):
+    """Common interface for save formats
+
+    A backend turns the nested dict built by `Gamebuilder.save_data` into
+    bytes and back. Files are named `<player><suffix>`.
+    """
+
+    suffix = ""
+
+    @abstractmethod
+    def dumps(self, data):
+        """encode save data"""
+
+    @abstractmethod
+    def loads(self, blob, lazy=False):
+        """decode save data
+
+        With `lazy`, backends which can may return "rooms" as a read-only
+        mapping which only decodes a room's record when it is looked up.
+        """
+
+    def dump(self, data, path):
+        """write save data to path"""
+
+        write_atomic(path, self.dumps(data))
+
+    def load(self, path, lazy=False):
+        """read save data from path"""
+
+        with open(path, "rb") as save_file:
+            return self.loads(save_file.read(), lazy)
+
+    def header(self, path):
+        """the header of the save at path, made up for older saves"""
+
+        data = self.load(path)
+        return data.get("header") or header(data, os.stat(path).st_mtime)
+
+
+class YamlBackend(SaveBackend):
+    """Human readable saves, through libyaml when it is installed"""
+
+    suffix = ".yml"
+
+    @staticmethod
+    def _loader():
+        return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+    @staticmethod
+    def _dumper():
+        return getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+    def dumps(self, data):
+        return yaml.dump(
+            data, Dumper=self._dumper(), indent=4, width=80
+        ).encode()
+
+    def loads(self, blob, lazy=False):
+        return yaml.load(blob, Loader=self._loader()) or {}
+
+    def header(self, path):
+        """the leading `header:` mapping, read without parsing the rest
+
+        Keys are dumped sorted, so the header comes first in every save
+        which has one; only older saves without it are read in full.
+        """
+
+        lines = []
+        with open(path, encoding="utf-8") as save_file:
+            for line in save_file:
+                if not line.startswith("header:" if not lines else " "):
+                    break
+                lines.append(line)
+        head = self.loads("".join(lines).encode()).get("header")
+        return head or super().header(path)
+
+
+class BinaryBackend(SaveBackend):
+    """Compact columnar saves in a numpy .npz archive
+
+    The maze is stored as 2-bit codes into its palette of colours, four
+    cells to a byte. Rooms and items become one array per field, with
+    adjacent rooms and item owners as indices into the room columns, so a
+    load is a handful of array reads rather than a parse of every value.
+    Items must be saved as template references.
+    """
+
+    suffix = ".dork"
+
+    def dumps(self, data):
+        rooms = data["rooms"]
+        index = {name: i for i, name in enumerate(rooms)}
+
+        columns = self._pack_maze(data["maze"])
+        columns.update(self._rooms(rooms, index))
+        columns.update(self._items(rooms, index))
+
+        players = []
+        for i, room in enumerate(rooms.values()):
+            for player in room["players"].values():
+                players.append({
+                    "room": i,
+                    **{
+                        key: val for key, val in player.items()
+                        if key != "inventory"
+                    }
+                })
+        columns["meta"] = _pack_strings([json.dumps({
+            "templates": data.get("templates", {}),
+            "players": players,
+            "extra": {
+                key: val for key, val in data.items()
+                if key not in ("maze", "rooms", "templates")
+            },
+        })])
+
+        out = io.BytesIO()
+        np.savez(out, **columns)
+        return out.getvalue()
+
+    def header(self, path):
+        with np.load(path, allow_pickle=False) as columns:
+            meta = json.loads(columns["meta"].tobytes())
+        return meta["extra"].get("header") or super().header(path)
+
+    def loads(self, blob, lazy=False):
+        with np.load(io.BytesIO(blob), allow_pickle=False) as columns:
+            meta = json.loads(columns["meta"].tobytes())
+            rooms = RoomRecords(columns, meta["players"])
+            return {
+                **meta.get("extra", {}),
+                "maze": self._unpack_maze(columns),
+                "rooms": rooms if lazy else dict(rooms.items()),
+                "templates": {
+                    int(ref): template
+                    for ref, template in meta["templates"].items()
+                },
+            }
+
+    @staticmethod
+    def _pack_maze(maze):
+        maze = np.asarray(maze, dtype=np.int8)
+        palette, codes = np.unique(maze, return_inverse=True)
+        codes = codes.astype(np.uint8).ravel()
+        if len(palette) <= 4:
+            codes = np.pad(codes, (0, -len(codes) % 4)).reshape(-1, 4)
+            codes = codes[:, 0] | codes[:, 1] << 2 | codes[:, 2] << 4 | \
+                codes[:, 3] << 6
+        return {
+            "maze": codes,
+            "maze_shape": np.array(maze.shape),
+            "palette": palette,
+        }
+
+    @staticmethod
+    def _unpack_maze(columns):
+        shape = columns["maze_shape"]
+        palette = columns["palette"]
+        codes = columns["maze"]
+        if len(palette) <= 4:
+            codes = np.stack([codes >> shift & 3 for shift in (0, 2, 4, 6)])
+            codes = codes.T.ravel()
+        return palette[codes[:shape.prod()]].reshape(shape).tolist()
+
+    @staticmethod
+    def _rooms(rooms, index):
+        adjacent = np.full((len(rooms), 4), -1, dtype=np.int32)
+        corridors = np.full((len(rooms), 4), MISSING, dtype=np.int32)
+        coords = np.zeros((len(rooms), 2), dtype=np.int32)
+        for i, room in enumerate(rooms.values()):
+            for j, cardinal in enumerate(CARDINALS):
+                adjacent[i, j] = index.get(room["adjacent"][cardinal], -1)
+                if cardinal in (room.get("corridors") or {}):
+                    length = room["corridors"][cardinal]
+                    corridors[i, j] = -1 if length is None else length
+            coords[i] = room["coordinates"]["x"], room["coordinates"]["y"]
+
+        return {
+            "room_name": _pack_strings(rooms),
+            "room_description": _pack_strings(
+                room["description"] for room in rooms.values()
+            ),
+            "room_xy": coords,
+            "room_adjacent": adjacent,
+            "room_corridors": corridors,
+        }
+
+    @staticmethod
+    def _items(rooms, index):
+        names, owners, holders, refs, stats = [], [], [], [], []
+        holder = 0
+
+        def _add(inventory, owner, held_by):
+            for name, item in inventory.items():
+                names.append(name)
+                owners.append(owner)
+                holders.append(held_by)
+                refs.append(item["template"])
+                stats.append([item.get(field, ABSENT) for field in FIELDS])
+
+        for name, room in rooms.items():
+            _add(room["inventory"], index[name], -1)
+        for name, room in rooms.items():
+            for player in room["players"].values():
+                _add(player["inventory"], index[name], holder)
+                holder += 1
+
+        return {
+            "item_name": _pack_strings(names),
+            "item_room": np.array(owners, dtype=np.int32),
+            "item_player": np.array(holders, dtype=np.int32),
+            "item_template": np.array(refs, dtype=np.int32),
+            "item_stats": np.array(
+                stats, dtype=np.int32
+            ).reshape(-1, len(FIELDS)),
+        }
+
+
+class RoomRecords(Mapping):
+    """Room records decoded from binary save columns one room at a time"""
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, columns, players):
+        self.xy = columns["room_xy"]
+        self.names = _unpack_strings(columns["room_name"], len(self.xy))
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.descriptions = _unpack_strings(
+            columns["room_description"], len(self.names)
+        )
+        self.adjacent = columns["room_adjacent"]
+        self.corridors = columns["room_corridors"]
+
+        self.players = {}
+        for i, player in enumerate(players):
+            self.players.setdefault(player["room"], []).append((i, player))
+
+        self.item_names = _unpack_strings(
+            columns["item_name"], len(columns["item_template"])
+        )
+        self.item_player = columns["item_player"]
+        self.split = int(np.searchsorted(self.item_player, 0))
+        self.item_room = columns["item_room"][:self.split]
+        self.item_template = columns["item_template"]
+        self.item_stats = columns["item_stats"]
+
+    def __getitem__(self, name):
+        i = self.index[name]
+        names = self.names
+        xy = self.xy[i].tolist()
+        low, high = np.searchsorted(self.item_room, [i, i+1]).tolist()
+
+        players = {}
+        for j, player in self.players.get(i, []):
+            low_j, high_j = np.searchsorted(
+                self.item_player, [j, j+1]
+            ).tolist()
+            record = {
+                key: val for key, val in player.items() if key != "room"
+            }
+            record["inventory"] = self._items(low_j, high_j)
+            players[record["name"]] = record
+
+        return {
+            "adjacent": {
+                cardinal: names[j] if j >= 0 else None
+                for cardinal, j in zip(CARDINALS, self.adjacent[i].tolist())
+            },
+            "coordinates": {"x": xy[0], "y": xy[1]},
+            "corridors": {
+                cardinal: length if length >= 0 else None
+                for cardinal, length in zip(
+                    CARDINALS, self.corridors[i].tolist()
+                )
+                if length != MISSING
+            },
+            "description": self.descriptions[i],
+            "inventory": self._items(low, high),
+            "name": name,
+            "players": players,
+        }
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def _items(self, low, high):
+        rows = zip(
+            self.item_names[low:high],
+            self.item_template[low:high].tolist(),
+            self.item_stats[low:high].tolist(),
+        )
+        return {
+            name: {
+                "template": ref,
+                **{
+                    field: val for field, val in zip(FIELDS, stats)
+                    if val != ABSENT
+                }
+            } for name, ref, stats in rows
+        }
+
+
+BACKENDS = {
+    "yaml": YamlBackend,
+    "binary": BinaryBackend,
+}
+
+
+def build(name="yaml"):
+    """make a save backend by name"""
+
+    return BACKENDS[name]()
+
+
+def format_of(path):
+    """the name of the backend which reads path, or None"""
+
+    suffix = os.path.splitext(path)[1]
+    for name, backend in BACKENDS.items():
+        if backend.suffix == suffix:
+            return name
+    return None
+
+
+class SaveIndex:
+    """Every save in a directory, by player name
+
+    The index is a small sqlite table beside the saves holding each
+    player's save format and save header, so finding a player's save is a
+    single keyed lookup and listing saves never opens a save file. Saves
+    missing from the index, such as those copied in by hand, are picked up
+    by `Gamebuilder.load_game` or by `rebuild`.
+    """
+
+    file_name = "index.sqlite"
+    columns = ("format", "width", "height", "rooms", "last_played")
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.path = os.path.join(directory, self.file_name)
+
+    def _read(self, query, params=()):
+        """the rows a query selects, without creating a missing index"""
+
+        if not os.path.exists(self.path):
+            return []
+        with closing(sqlite3.connect(self.path)) as conn:
+            return conn.execute(query, params).fetchall()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS saves (player TEXT PRIMARY KEY, "
+            "format TEXT, width INTEGER, height INTEGER, rooms INTEGER, "
+            "last_played REAL)"
+        )
+        return conn
+
+    def lookup(self, player):
+        """the format and header of a player's save, or None"""
+
+        rows = self._read(
+            f"SELECT {', '.join(self.columns)} FROM saves WHERE player = ?",
+            (player,)
+        )
+        return dict(zip(self.columns, rows[0])) if rows else None
+
+    def record(self, player, save_format, head):
+        """add or replace a player's entry"""
+
+        row = (player, save_format, *(head[key] for key in self.columns[1:]))
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?)",
+                    row
+                )
+
+    def forget(self, player):
+        """drop a player's entry"""
+
+        if not os.path.exists(self.path):
+            return
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute("DELETE FROM saves WHERE player = ?", (player,))
+
+    def listing(self):
+        """every entry, most recently played first"""
+
+        rows = self._read(
+            f"SELECT player, {', '.join(self.columns)} FROM saves "
+            "ORDER BY last_played DESC"
+        )
+        return [dict(zip(("player",) + self.columns, row)) for row in rows]
+
+    def rebuild(self):
+        """re-index every save in the directory from its header
+
+        When a player has saves in more than one format the newest wins.
+        """
+
+        newest = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                save_format = format_of(entry.name)
+                if save_format is None:
+                    continue
+                player = os.path.splitext(entry.name)[0]
+                found = (entry.stat().st_mtime, save_format, entry.path)
+                newest[player] = max(newest.get(player, found), found)
+
+        rows = []
+        for player, (_, save_format, path) in newest.items():
+            head = build(save_format).header(path)
+            rows.append(
+                (player, save_format, *(head[key] for key in self.columns[1:]))
+            )
+        with closing(self._connect()) as conn:
+            with conn:
+                conn.execute("DELETE FROM saves")
+                conn.executemany(
+                    "INSERT INTO saves VALUES (?, ?, ?, ?, ?, ?)", rows
+                )
+        return len(rows)
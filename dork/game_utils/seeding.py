@@ -0,0 +1,47 @@
+"""Seeded random streams for world generation"""
+
+
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = ["Seeds", "STREAMS", "CHUNK", "default_rng"]
+
+
+np = LazyModule("numpy")
+
+STREAMS = ("maze", "loot", "npcs", "stats")
+CHUNK = 256
+
+_DEFAULT = []
+
+
+class Seeds:
+    """Independent random streams derived from one seed
+
+    Every stream is a numpy Generator spawned from the seed's SeedSequence
+    with a fixed spawn key of (subsystem, *key), rather than by spawning
+    children in turn. A stream therefore only depends on the seed and its
+    key, never on which streams were drawn before it, so rooms can be
+    generated in any order or in other processes and still come out
+    byte-identical. Loot, NPC and stat streams are keyed by chunks of
+    `CHUNK` rooms.
+    """
+
+    def __init__(self, seed=None):
+        self.entropy = np.random.SeedSequence(seed).entropy
+
+    def stream(self, name, *key):
+        """a generator for one subsystem, optionally narrowed by key"""
+
+        sequence = np.random.SeedSequence(
+            self.entropy, spawn_key=(STREAMS.index(name), *key)
+        )
+        return np.random.default_rng(sequence)
+
+
+def default_rng():
+    """the shared, unseeded generator used when no stream is given"""
+
+    if not _DEFAULT:
+        _DEFAULT.append(np.random.default_rng())
+    return _DEFAULT[0]
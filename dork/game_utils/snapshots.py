@@ -0,0 +1,74 @@
+"""Copy-on-write snapshots of a game's save data"""
+
+
+from collections import ChainMap
+from dork.game_utils.saves import RoomRecords
+
+
+__all__ = ["Snapshots"]
+
+
+class Snapshots:
+    """Copy-on-write snapshots of a game's save data"""
+
+    def __init__(self, game, room_data, raw_room_data):
+        self.game = game
+        self.room_data = room_data
+        self.templates = {
+            template: ref
+            for ref, template in getattr(game.rooms, "templates", {}).items()
+        }
+        self.maze = [list(row) for row in game.maze]
+        self.dirty = {}
+
+        records = getattr(game.rooms, "records", game.rooms)
+        built = getattr(game.rooms, "built", game.rooms)
+        self.records = None
+        if isinstance(records, RoomRecords):
+            self.records = records
+        self.rooms = {}
+        for name in built if self.records is not None else records:
+            if name in built:
+                self.rooms[name] = room_data(built[name], self._item)
+            else:
+                self.rooms[name] = raw_room_data(records[name], self._item)
+
+    def _item(self, item):
+        ref = self.templates.setdefault(item.template, len(self.templates))
+        return {"template": ref, **item.template.unpack(item.deltas)}
+
+    def touch(self, *rooms):
+        """note rooms whose contents, or maze cells, have changed"""
+
+        for room in rooms:
+            self.dirty[room.name] = room
+
+    def take(self):
+        """the game's save data as of now"""
+
+        game = self.game
+        for name, room in self.dirty.items():
+            self.maze[room.x] = list(game.maze[room.x])
+            self.rooms[name] = self.room_data(room, self._item)
+        self.dirty.clear()
+
+        rooms = dict(self.rooms)
+        if self.records is not None:
+            rooms = ChainMap(rooms, self.records)
+
+        data = {
+            "maze": list(self.maze),
+            "rooms": rooms,
+            "templates": {
+                ref: {
+                    "type": template.type,
+                    "description": template.description,
+                    **template.fixed
+                } for template, ref in self.templates.items()
+            },
+        }
+        if game.hero.location is not None:
+            data["hero"] = game.hero.location.name
+        if game.journal is not None:
+            data["journal"] = game.journal.seq
+        return data
@@ -0,0 +1,137 @@
+"""Per-command latency statistics"""
+
+
+import heapq
+import json
+from time import perf_counter_ns
+from dork.game_utils.lazy import LazyModule
+
+
+__all__ = ["CommandStats"]
+
+
+cprofile = LazyModule("cProfile")
+pstats = LazyModule("pstats")
+
+
+class CommandStats:
+    """Wall-time histograms of the Game methods commands call
+
+    Times go into power-of-two buckets of nanoseconds, from everything
+    under `2**FLOOR` to everything from `2**(FLOOR + BUCKETS - 2)` on, so
+    recording a command is a few integer operations. With `profile`,
+    every command also runs under cProfile and the profiles of the
+    `profile` slowest are kept. `path`, if given, is where `dump` writes.
+    """
+
+    FLOOR = 10
+    BUCKETS = 22
+
+    def __init__(self, path=None, profile=0):
+        self.path = path
+        self.profile = profile
+        self.handlers = {}
+        self.slowest = []
+        self.seq = 0
+
+    def time(self, call, cmd, arg):
+        """call(cmd, arg), timed under the handler cmd"""
+
+        profiler = None
+        if self.profile:
+            profiler = cprofile.Profile()
+            profiler.enable()
+        start = perf_counter_ns()
+        out = call(cmd, arg)
+        elapsed = perf_counter_ns() - start
+        if profiler is not None:
+            profiler.disable()
+            self._keep(elapsed, cmd, arg, profiler)
+        self.record(cmd, elapsed)
+        return out
+
+    def record(self, cmd, elapsed):
+        """add one call of cmd which took elapsed nanoseconds"""
+
+        entry = self.handlers.get(cmd)
+        if entry is None:
+            entry = self.handlers[cmd] = {
+                "count": 0, "total": 0, "max": 0,
+                "buckets": [0]*self.BUCKETS,
+            }
+        entry["count"] += 1
+        entry["total"] += elapsed
+        entry["max"] = max(entry["max"], elapsed)
+        bucket = min(
+            max(elapsed.bit_length() - self.FLOOR, 0), self.BUCKETS - 1
+        )
+        entry["buckets"][bucket] += 1
+
+    def _keep(self, elapsed, cmd, arg, profiler):
+        """hold on to the profile if it is among the slowest"""
+
+        self.seq += 1
+        entry = (elapsed, self.seq, cmd, arg, profiler)
+        if len(self.slowest) < self.profile:
+            heapq.heappush(self.slowest, entry)
+        elif elapsed > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def percentile(self, cmd, pct):
+        """upper bound in nanoseconds of cmd's pct-th percentile"""
+
+        entry = self.handlers[cmd]
+        wanted = entry["count"]*pct/100
+        seen = 0
+        for bucket, count in enumerate(entry["buckets"]):
+            seen += count
+            if seen >= wanted and bucket < self.BUCKETS - 1:
+                return min(2**(bucket + self.FLOOR), entry["max"])
+        return entry["max"]
+
+    def report(self):
+        """a table of calls and latencies per handler, slowest first"""
+
+        if not self.handlers:
+            return "No commands timed yet."
+
+        out = (
+            f"{'handler':<16}{'calls':>7}{'mean us':>10}"
+            f"{'p50 us':>10}{'p99 us':>10}{'max us':>10}"
+        )
+        for cmd, entry in sorted(
+                self.handlers.items(), key=lambda item: -item[1]["total"]):
+            out += (
+                f"\n{cmd:<16}{entry['count']:>7}"
+                f"{entry['total']/entry['count']/1000:>10.1f}"
+                f"{self.percentile(cmd, 50)/1000:>10.1f}"
+                f"{self.percentile(cmd, 99)/1000:>10.1f}"
+                f"{entry['max']/1000:>10.1f}"
+            )
+        for elapsed, _, cmd, arg, _ in sorted(self.slowest, reverse=True):
+            out += f"\nslow: {cmd}({arg or ''}) took {elapsed/1000:.1f}us"
+        return out
+
+    def dump(self, path=None):
+        """write the histograms as JSON, with profiles of the slowest
+
+        Each kept profile goes beside the JSON file as `{path}.{n}.prof`,
+        readable with pstats.
+        """
+
+        path = self.path if path is None else path
+        slowest = []
+        for rank, (elapsed, _, cmd, arg, profiler) in enumerate(
+                sorted(self.slowest, reverse=True), 1):
+            prof = f"{path}.{rank}.prof"
+            pstats.Stats(profiler).dump_stats(prof)
+            slowest.append({
+                "handler": cmd, "arg": arg, "ns": elapsed, "profile": prof
+            })
+        with open(path, "w", encoding="utf-8") as stream:
+            json.dump({
+                "floor": self.FLOOR,
+                "handlers": self.handlers,
+                "slowest": slowest,
+            }, stream, indent=1)
+        return path
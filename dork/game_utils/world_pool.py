@@ -0,0 +1,116 @@
+"""Pre-generated worlds for new games"""
+
+
+import os
+from collections import deque
+from dork.game_utils import saves
+from dork.game_utils.lazy import LazyModule
+from dork.game_utils.factories import MazeFactory
+
+
+__all__ = ["WorldPool", "stock"]
+
+
+#  multiprocessing is slow to import, so leave it until a pool starts
+futures = LazyModule("concurrent.futures")
+uuid = LazyModule("uuid")
+
+
+def _generate(world):
+    """build one world, run inside a worker process"""
+
+    return MazeFactory.build(**world)
+
+
+def _store(directory, world):
+    """build one world and drop it into an on-disk pool as YAML"""
+
+    name = os.path.join(directory, uuid.uuid4().hex + ".world")
+    saves.build("yaml").dump(_generate(world), name)
+    return name
+
+
+def stock(directory, count, **world):
+    """fill an on-disk pool with count freshly generated worlds"""
+
+    os.makedirs(directory, exist_ok=True)
+    with futures.ProcessPoolExecutor() as executor:
+        jobs = [
+            executor.submit(_store, directory, world) for _ in range(count)
+        ]
+        return [job.result() for job in jobs]
+
+
+class WorldPool:
+    """Worlds generated in a worker process ahead of time
+
+    `start` begins generating `size` worlds straight away, so a world is
+    usually ready by the time the player has typed their name and `take` is
+    a hand-off rather than a full generation. Every world taken is replaced
+    in the background. With a `directory`, worlds are claimed from that
+    on-disk pool of YAML saves first and the worker restocks it one world
+    at a time.
+    """
+
+    def __init__(self, size=1, directory=None, **world):
+        self.size = size
+        self.directory = directory
+        self.world = world
+        self.executor = None
+        self.ready = deque()
+
+    def start(self):
+        """spin up the worker and begin generating"""
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        self.executor = futures.ProcessPoolExecutor(max_workers=1)
+        self._refill()
+        return self
+
+    def take(self):
+        """hand over a pre-generated world"""
+
+        data = self._claim()
+        if data is None and self.ready:
+            data = self.ready.popleft().result()
+        elif data is None:
+            data = _generate(self.world)
+        self._refill()
+        return data
+
+    def close(self):
+        """stop the worker, dropping any worlds not yet generated"""
+
+        for job in self.ready:
+            job.cancel()
+        self.ready.clear()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def _refill(self):
+        while self.executor is not None and len(self.ready) < self.size:
+            self.ready.append(self.executor.submit(_generate, self.world))
+
+    def _claim(self):
+        """take a world from the on-disk pool, if there is one"""
+
+        if not self.directory:
+            return None
+
+        with os.scandir(self.directory) as entries:
+            names = [e.path for e in entries if e.name.endswith(".world")]
+
+        for name in names:
+            claimed = name + ".claimed"
+            try:
+                os.replace(name, claimed)
+            except FileNotFoundError:
+                continue
+            data = saves.build("yaml").load(claimed)
+            os.remove(claimed)
+            if self.executor is not None:
+                self.executor.submit(_store, self.directory, self.world)
+            return data
+        return None
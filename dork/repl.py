@@ -1,7 +1,10 @@
 """This is the REPL which parses commands and passes them to a Game object."""
 
 
-from dork.game_utils import game_data
+import sys
+from functools import lru_cache
+from time import perf_counter
+from dork.game_utils import game_data, renderers
 from dork import types as dork_types
 # pylint: disable=protected-access
 
@@ -12,11 +15,13 @@ _META = game_data.META
 _ERRS = game_data.ERRS
 
 
-def _new_game(player_name=None):
+def _new_game(player_name=None, renderer=None, **world):
     if not player_name:
         player_name = input("What's your name, stranger? ")
 
-    dork = dork_types.Gamebuilder.build(player_name)
+    dork = dork_types.Gamebuilder.build(player_name, **world)
+    if renderer is not None:
+        dork.renderer = renderer()
     print(f"\nGreetings, {dork.hero.name}! " + game_data.TITLE + "\n")
 
     return dork
@@ -28,47 +33,137 @@ def _read():
     return str.casefold(input("> "))
 
 
-def _evaluate(cmd, dork):
-    """Parse a command and execute it"""
+def _compile():
+    """verb -> (handler, arity, bound arg), or noun -> (handler, arg)
+
+    Commands take precedence over moves, and moves over meta commands.
+    """
 
-    cmd = cmd.strip().split(" ", 1)
-    if cmd[0]:
-        verb, *noun = cmd
-        noun = noun[0] if noun else None
-        call = _CMDS.get(verb, _MOVES.get(verb, _META.get(verb, _ERRS["u"])))
-
-        if isinstance(call, dict):
-            method, arg = call.get(noun, _ERRS["which way"])
-        elif call not in _ERRS.values():
-            if verb == noun:
-                method, arg = _ERRS["twice"]
-            elif len(call) > 1:
-                if noun:
-                    method, arg = _ERRS["which way"]
-                else:
-                    method, arg = call
-            elif noun and len(call) == 1:
-                method, arg = call[0], noun
+    def _entry(call):
+        method, *bound = call
+        return method, dork_types.Game.arity[method], (bound or [None])[0]
+
+    table = {}
+    for commands in [_META, _MOVES, _CMDS]:
+        for verb, call in commands.items():
+            if isinstance(call, dict):
+                table[verb] = {noun: tuple(sub) for noun, sub in call.items()}
             else:
-                method, arg = call[0], None
-        else:
-            method, arg = call
+                table[verb] = _entry(call)
+    return table
 
-    else:
+
+_TABLE = _compile()
+
+
+@lru_cache(maxsize=1024)
+def _parse(cmd):
+    """the (method, arg) a line of input calls"""
+
+    verb, _, noun = cmd.strip().partition(" ")
+    noun = noun or None
+    entry = _TABLE.get(verb)
+
+    if not verb:
         method, arg = _ERRS["?"]
+    elif entry is None:
+        method, arg = _ERRS["u"]
+    elif isinstance(entry, dict):
+        method, arg = entry.get(noun, _ERRS["which way"])
+    elif verb == noun:
+        method, arg = _ERRS["twice"]
+    elif entry[2] is not None:
+        method, arg = _ERRS["which way"] if noun else (entry[0], entry[2])
+    elif noun and not entry[1]:
+        method, arg = _ERRS["no args"]
+    else:
+        method, arg = entry[0], noun
+    return method, arg
+
 
-    return dork(method, arg)
+def _evaluate(cmd, dork):
+    """Parse a command and execute it"""
 
+    return dork(*_parse(cmd))
 
-def repl():
+
+def repl(renderer=None, **world):
     """read evaluate print loop"""
 
-    dork = _new_game()
+    dork = _new_game(renderer=renderer, **world)
     should_exit = False
 
     while not should_exit:
         output, should_exit = _evaluate(cmd=_read(), dork=dork)
         if output == "new game":
-            dork = _new_game()
+            dork.close()
+            dork = _new_game(renderer=renderer, **world)
         else:
             print(output + "\n")
+    dork.close()
+
+
+def script(lines, player_name="scripted", out=None, report=None, **world):
+    """evaluate lines of commands without a terminal
+
+    Lines are casefolded like typed input and lines starting with # are
+    skipped. Nothing is drawn, `.new` starts over without asking, and the
+    transcript is buffered and written to `out` in one go. Runtime and
+    commands per second go to `report`. Returns the number of commands
+    evaluated and the seconds spent evaluating them.
+    """
+
+    started = perf_counter()
+
+    def _start():
+        dork = dork_types.Gamebuilder.build(player_name, **world)
+        dork.renderer = renderers.NullRenderer()
+        dork.interactive = False
+        return dork
+
+    dork = _start()
+    built = perf_counter()
+    transcript = [f"Greetings, {dork.hero.name}!\n"]
+    count = 0
+    for line in lines:
+        line = str.casefold(line.rstrip("\n"))
+        if line.lstrip().startswith("#"):
+            continue
+        count += 1
+        transcript.append(f"> {line}\n")
+        output, should_exit = _evaluate(line, dork)
+        if output == "new game":
+            dork.close()
+            dork = _start()
+            output = f"Greetings, {dork.hero.name}!"
+        transcript.append(output + "\n\n")
+        if should_exit:
+            break
+    dork.close()
+    seconds = _write_out(
+        transcript, count, (started, built, perf_counter()), out, report
+    )
+    return count, seconds
+
+
+def _write_out(transcript, count, times, out=None, report=None):
+    """write a script's transcript to out and its timings to report
+
+    `times` are when the script started, when its game was built and when
+    it finished. Returns the seconds spent evaluating commands.
+    """
+
+    started, built, finished = times
+    out = sys.stdout if out is None else out
+    report = sys.stderr if report is None else report
+
+    out.write("".join(transcript))
+    out.flush()
+
+    seconds = finished - built
+    rate = count/seconds if seconds else float("inf")
+    report.write(
+        f"{count} commands in {seconds:.3f}s ({rate:.0f} commands/s), "
+        f"{finished - started:.3f}s in total\n"
+    )
+    return seconds
@@ -3,97 +3,321 @@
 
 
 import os
-from copy import deepcopy
-from random import choices, choice, randint, shuffle
-from operator import add
+import time
+from weakref import WeakSet
+from functools import partial
+from itertools import islice
 from inspect import getfullargspec as argspec
-import yaml
-import matplotlib.pyplot as plt
-from numpy import full as npf
 import dork.game_utils.factory_data as factory_data
+from dork.game_utils import game_data, renderers, saves
+from dork.game_utils.autosave import Autosave
+from dork.game_utils.factories import (
+    ItemFactory, MazeFactory, PlayerFactory, RoomFactory
+)
+from dork.game_utils.inventory import Inventory, selector
+from dork.game_utils.journal import Journal
+from dork.game_utils.lazy_rooms import LazyRooms
+from dork.game_utils.snapshots import Snapshots
+from dork.game_utils.stats import CommandStats
 # pylint: disable=protected-access
 
 
+__all__ = [
+    "attrs", "arity", "Grandparent", "Inventory", "Holder", "Stats",
+    "ItemTemplate", "Adjacent", "Coord", "Item", "Player", "Room",
+    "LazyRooms", "Snapshots", "Gamebuilder", "Game", "ItemFactory",
+    "PlayerFactory", "RoomFactory", "MazeFactory",
+]
+
+
+def attrs(obj):
+    """vars() for slotted objects, in slot order, without private slots"""
+
+    if isinstance(obj, Item):
+        return obj.record()
+
+    clz = type(obj)
+    if clz not in _SLOTS:
+        names = []
+        for base in reversed(clz.__mro__):
+            for name in base.__dict__.get("__slots__", ()):
+                if name not in names and not name.startswith("_"):
+                    names.append(name)
+        _SLOTS[clz] = names
+    return {name: getattr(obj, name) for name in _SLOTS[clz]}
+
+
+_SLOTS = {}
+
+
+def arity(func):
+    """how many arguments a command handler takes, not counting self"""
+
+    args = argspec(func).args
+    return len(args) - 1 if args[:1] == ["self"] else len(args)
+
+
 class Grandparent:
-    """common parent of holder, adjacent, and coord"""
+    """common parent of holder, adjacent, and coord
+
+    Every game object is slotted rather than carrying a __dict__. Adjacent
+    and Coord are mixins with no slots of their own, since only one base of
+    Room may define slots; their fields are declared and set by Room.
+    """
+
+    __slots__ = ()
 
 
 class Holder(Grandparent):
     """A holder/container of items"""
 
+    __slots__ = ("inventory", "_listed")
+    per_page = 20
+
     def __init__(self):
         super().__init__()
-        self.inventory = {}
-
-    def get_items(self, caller, verbose):
-        """Print all inventory items"""
+        self.inventory = Inventory()
+        self._listed = None
+
+    def get_items(self, caller, verbose, page=1):
+        """List inventory items, a page of `per_page` at a time
+
+        Only the items on the page are rendered, and the page is kept
+        until the inventory next changes. Page None lists everything.
+        """
+
+        if not self.inventory:
+            return "There's nothing here."
+
+        pages = -(-len(self.inventory)//self.per_page)
+        if page is not None and not 1 <= page <= pages:
+            return f"There is no page {page}, only {pages}."
+
+        key = (self.inventory.version, verbose)
+        if self._listed is None or self._listed[0] != key:
+            self._listed = (key, {})
+        listed = self._listed[1]
+        if page not in listed:
+            start = 0 if page is None else (page - 1)*self.per_page
+            stop = None if page is None else start + self.per_page
+            listed[page] = "".join(self.iter_items(verbose, start, stop))
+
+        out = f"\n{caller} inventory:" + listed[page]
+        if page is not None and pages > 1:
+            out += f"\n(page {page} of {pages})"
+        return out
 
-        if self.inventory:
-            out = f"\n{caller} inventory:"
-        else:
-            out = f"There's nothing here."
+    def iter_items(self, verbose, start=0, stop=None):
+        """the listing of each inventory item from start to stop"""
 
-        for name, item in self.inventory.items():
-            out += "\n    " + name
+        for name, item in islice(self.inventory.items(), start, stop):
+            yield "\n    " + name
             if verbose:
-                out += Game._verbose_print(vars(item))
-        return out
+                yield Game._verbose_print(attrs(item))
+
+
+def _stat(field):
+    """a read-only item stat, looked up through the item's template"""
+
+    return property(
+        lambda item: item.template.value(item.deltas, field),
+        doc=f"the item's {field}"
+    )
 
 
 class Stats:
     """stats for items"""
 
-    def __init__(self):
-        self.attack = int
-        self.strength = int
-        self.weight = int
-        self.luck = int
-        self.equipable = bool
+    __slots__ = ()
+
+    attack = _stat("attack")
+    strength = _stat("strength")
+    weight = _stat("weight")
+    luck = _stat("luck")
+    equipable = _stat("equipable")
+    amount = _stat("amount")
+
+
+class ItemTemplate:
+    """Immutable data shared by every item of one kind
+
+    A template holds an item's type, description and every stat that is
+    fixed for that kind of item. Stats rolled from a range in
+    `factory_data.STATS` are stored by each item as deltas from the bottom
+    of their range, packed into one small int. Templates are interned, so
+    a world with millions of items holds only a few hundred of them.
+    """
+
+    __slots__ = ("type", "description", "fixed", "rolled")
+    interned = {}
+
+    def __init__(self, item_type, description, fixed):
+        self.type = item_type
+        self.description = description
+        self.fixed = dict(fixed)
+        self.rolled = []
+
+        rules = factory_data.STATS.get(str(item_type).split()[0], {})
+        offset = 0
+        for field, default in factory_data.STAT_DEFAULTS.items():
+            rule = rules.get(field, default)
+            if field not in self.fixed:
+                width = (rule[1] - rule[0]).bit_length()
+                self.rolled.append((field, rule[0], offset, (1 << width) - 1))
+                offset += width
+
+    @staticmethod
+    def get(item_type, description, fixed):
+        """the shared template for a type, description and fixed stats"""
+
+        key = (item_type, description, tuple(sorted(fixed.items())))
+        if key not in ItemTemplate.interned:
+            ItemTemplate.interned[key] = ItemTemplate(*key[:2], fixed)
+        return ItemTemplate.interned[key]
+
+    @staticmethod
+    def intern(item_type, description="", **stats):
+        """the template for a full set of item stats, and its packed deltas
+
+        Stats outside their usual range, such as those from older saves,
+        become fixed values of a template of their own.
+        """
+
+        rules = factory_data.STATS.get(str(item_type).split()[0], {})
+        fixed, rolled = {}, {}
+        for field, default in factory_data.STAT_DEFAULTS.items():
+            rule = rules.get(field, default)
+            value = stats.get(field)
+            if isinstance(rule, tuple) and isinstance(value, int) and \
+                    rule[0] <= value <= rule[1]:
+                rolled[field] = value
+            else:
+                fixed[field] = value
+
+        template = ItemTemplate.get(item_type, description, fixed)
+        return template, template.pack(rolled)
+
+    def pack(self, rolled):
+        """pack rolled stats into deltas"""
+
+        deltas = 0
+        for field, low, offset, _ in self.rolled:
+            deltas |= (rolled[field] - low) << offset
+        return deltas
+
+    def unpack(self, deltas):
+        """the rolled stats packed into deltas"""
+
+        return {
+            field: low + (deltas >> offset & mask)
+            for field, low, offset, mask in self.rolled
+        }
+
+    def value(self, deltas, field):
+        """one stat of an item with these deltas"""
+
+        if field in self.fixed:
+            return self.fixed[field]
+        for name, low, offset, mask in self.rolled:
+            if name == field:
+                return low + (deltas >> offset & mask)
+        raise AttributeError(field)
+
+    def values(self, deltas):
+        """every stat of an item with these deltas, in the usual order"""
+
+        stats = {**self.fixed, **self.unpack(deltas)}
+        return {field: stats[field] for field in factory_data.STAT_DEFAULTS}
 
 
 class Adjacent(Grandparent):
     """adjacency object for rooms"""
 
-    def __init__(self):
-        super().__init__()
-        self.north = str
-        self.south = str
-        self.east = str
-        self.west = str
+    __slots__ = ()
+    fields = ("north", "south", "east", "west")
 
 
 class Coord(Grandparent):
     """coordinate object for rooms"""
 
-    def __init__(self):
-        super().__init__()
-        self.x = int
-        self.y = int
+    __slots__ = ()
+    fields = ("x", "y")
 
 
 class Item(Stats):
     """An obtainable/usable item"""
 
-    def __init__(self):
+    __slots__ = ("template", "deltas")
+
+    def __init__(self, template=None, deltas=0):
         super().__init__()
-        self.description = str
-        self.type = str
+        if template is None:
+            template = ItemTemplate.get(None, None, dict.fromkeys(
+                factory_data.STAT_DEFAULTS
+            ))
+        self.template = template
+        self.deltas = deltas
+
+    @property
+    def type(self):
+        """the item's type"""
+
+        return self.template.type
+
+    @property
+    def description(self):
+        """the item's description"""
+
+        return self.template.description
+
+    @staticmethod
+    def from_record(templates=None, **record):
+        """an item from generated or saved data
+
+        Saved items refer to one of `templates` by id and list only their
+        rolled stats, while generated and older saved items carry their
+        type, description and stats in full.
+        """
+
+        stats = {**record.pop("stats", {}), **record}
+        if "template" in stats:
+            template = templates[stats.pop("template")]
+            return Item(template, template.pack(stats))
+        return Item(*ItemTemplate.intern(
+            stats.pop("type", None), stats.pop("description", None), **stats
+        ))
+
+    def record(self):
+        """the item's stats, description and type"""
+
+        return {
+            **self.template.values(self.deltas),
+            "description": self.description,
+            "type": self.type,
+        }
 
 
 class Player(Holder):
-    """A player or npc in the game"""
+    """A player or npc in the game
+
+    `instances` holds every player still alive anywhere, weakly; a game
+    looks its own players up by name in `Game.players`.
+    """
 
-    instances = []
+    __slots__ = (
+        "name", "description", "location", "equipped", "__weakref__"
+    )
+    instances = WeakSet()
 
     def __init__(self):
         super().__init__()
-        self.name = str
-        self.description = str
-        self.location = Room
-        self.equipped = list
-        self.instances.append(self)
+        self.name = None
+        self.description = None
+        self.location = None
+        self.equipped = []
+        self.instances.add(self)
 
-    def move(self, cardinal, maze):
+    def move(self, cardinal, maze, renderer=None):
         """walk this way"""
 
         adjacent_room = getattr(self.location, cardinal)
@@ -104,54 +328,99 @@ class Player(Holder):
             adjacent_room.players[self.name] = \
                 self.location.players.pop(self.name)
 
-            maze[self.location.x][self.location.y] = MazeFactory.room_color
+            old = (self.location.x, self.location.y)
+            new = (adjacent_room.x, adjacent_room.y)
+            maze[old[0]][old[1]] = MazeFactory.room_color
             self.location = adjacent_room
-            maze[self.location.x][self.location.y] = MazeFactory.player_color
+            maze[new[0]][new[1]] = MazeFactory.player_color
 
-            MazeFactory.update(maze)
+            if renderer is not None:
+                renderer.update(maze, [old, new], new)
             out = self.location.description
         return out
 
 
 class Room(Adjacent, Coord, Holder):
     """A room on the worldmap"""
-    # pylint: disable=too-many-instance-attributes
 
-    instances = []
+    __slots__ = Adjacent.fields + Coord.fields + (
+        "name", "description", "corridors", "players", "__weakref__"
+    )
+    instances = WeakSet()
 
     def __init__(self):
         super().__init__()
-        self.description = str
+        for field in Adjacent.fields + Coord.fields:
+            setattr(self, field, None)
+        self.name = None
+        self.description = None
+        self.corridors = {}
         self.players = {}
-        self.instances.append(self)
+        self.instances.add(self)
 
     def _take(self, hero, item_name):
-        out = ""
-        if not item_name:
-            room_copy = deepcopy(self.inventory)
-            for item in room_copy:
-                hero.inventory[item] = self.inventory.pop(item)
-                out += f"You took {item}\n"
-        elif item_name in self.inventory:
+        if item_name in self.inventory:
             hero.inventory[item_name] = self.inventory.pop(item_name)
-            out += f"You took {item_name}. You took it well."
-        else:
-            out = f"There is no {item_name} here."
-        return out, False
+            return f"You took {item_name}. You took it well.", False
+
+        taken = Room._move_all(self.inventory, hero.inventory, item_name)
+        if taken is None:
+            missing = item_name[4:] if item_name.startswith("all ") \
+                else item_name
+            return f"There is no {missing} here.", False
+        return Room._moved("You took", taken), False
 
     def _drop(self, hero, item_name):
-        out = ""
-        if not item_name:
-            player_copy = deepcopy(hero.inventory)
-            for item in player_copy:
-                self.inventory[item] = hero.inventory.pop(item)
-                out += f"You dropped {item}\n"
-        elif item_name in hero.inventory:
+        if item_name in hero.inventory:
             self.inventory[item_name] = hero.inventory.pop(item_name)
-            out += f"You dropped {item_name}. How clumsy."
-        else:
-            out = f"There is no {item_name} in your inventory."
-        return out, False
+            return f"You dropped {item_name}. How clumsy.", False
+
+        dropped = Room._move_all(hero.inventory, self.inventory, item_name)
+        if dropped is None:
+            missing = item_name[4:] if item_name.startswith("all ") \
+                else item_name
+            return f"There is no {missing} in your inventory.", False
+        return Room._moved("You dropped", dropped), False
+
+    @staticmethod
+    def _move_all(source, target, arg):
+        """move every item, or every one matching `all FILTER`, in bulk
+
+        Items go across in one dict update rather than one at a time.
+        Returns the names moved, or None when arg is not a bulk move or
+        no item matches its filter.
+        """
+
+        if arg in (None, "all"):
+            names = list(source)
+            target.update(source)
+            source.clear()
+            return names
+
+        word, _, spec = arg.partition(" ")
+        if word != "all" or not spec:
+            return None
+        keep = selector(spec)
+        moved, kept = {}, {}
+        for name, item in source.items():
+            (moved if keep(item) else kept)[name] = item
+        if not moved:
+            return None
+        target.update(moved)
+        source.clear()
+        source.update(kept)
+        return list(moved)
+
+    @staticmethod
+    def _moved(verb, names):
+        """a line per moved item, up to a page of them"""
+
+        out = "".join(
+            f"{verb} {name}\n" for name in names[:Holder.per_page]
+        )
+        if len(names) > Holder.per_page:
+            out += f"...and {len(names) - Holder.per_page} more\n"
+        return out
 
 
 class Gamebuilder:
@@ -164,15 +433,33 @@ class Gamebuilder:
         "players": Player,
         "inventory": Item,
     }
+    templates = {}
+    save_dir = "./dork/saves"
+
+    #  new worlds come from `pool` if there is one. `journal` journals
+    #  every command and saves every N, `lazy` builds rooms as they are
+    #  reached, `autosave` saves every N changes or `autosave_interval`
+    #  seconds, and `stats` times commands, to a file if it is a path,
+    #  with cProfile captures of the `profile` slowest
+    options = {
+        "pool": None, "save_format": None, "journal": None, "lazy": False,
+        "autosave": None, "autosave_interval": None, "stats": None,
+        "profile": 0,
+    }
 
     @staticmethod
-    def build(player_name):
-        """Instantiate a game of Dork from dictionary"""
+    def build(player_name, width=None, height=None, seed=None, options=None):
+        """Instantiate a game of Dork, with any of `options` overridden"""
 
-        data = Gamebuilder.load_game(player_name)
+        options = {**Gamebuilder.options, **(options or {})}
+        data = Gamebuilder.load_game(player_name, options["lazy"])
+        saved = bool(data)
 
         if not data:
-            data = MazeFactory.build()
+            if options["pool"] is not None:
+                data = options["pool"].take()
+            else:
+                data = MazeFactory.build(width, height, seed)
 
             hero_data = {
                 "name": player_name,
@@ -183,20 +470,113 @@ class Gamebuilder:
             }
 
             data["rooms"]["room 0"]["players"][player_name] = hero_data
+            data["hero"] = "room 0"
+
+        game = Gamebuilder.make_game(data, options["lazy"])
+        if options["lazy"]:
+            hero = game.rooms[
+                data.get("hero") or Gamebuilder._find_hero(data, player_name)
+            ].players[player_name]
+            game.rooms.link(hero.location)
+        else:
+            hero = game.players[player_name]
+
+        game.hero = hero
+        game.maze[hero.location.x][hero.location.y] = MazeFactory.player_color
+        Gamebuilder._attach(
+            game, options, data.get("journal", 0) if saved else None
+        )
+        return game
+
+    @staticmethod
+    def _attach(game, options, seq):
+        """set the save format, journal, autosave and stats of a game"""
+
+        if options["save_format"] is not None:
+            game.save_format = options["save_format"]
+        if options["journal"]:
+            Gamebuilder._start_journal(game, options["journal"], seq)
+        if options["autosave"] or options["autosave_interval"]:
+            game.autosave = Autosave(
+                Gamebuilder.snapshots(game),
+                partial(
+                    Gamebuilder.write_save, game.hero.name, game.save_format
+                ),
+                options["autosave"], options["autosave_interval"]
+            )
+        stats = options["stats"]
+        if stats or options["profile"]:
+            game.stats = CommandStats(
+                None if stats in (None, True) else stats, options["profile"]
+            )
+
+    @staticmethod
+    def journal_path(player):
+        """where a player's journal lives"""
+
+        return os.path.join(Gamebuilder.save_dir, player + ".journal")
+
+    @staticmethod
+    def _start_journal(game, every, seq):
+        """attach a journal, replaying whatever the last save missed
+
+        A fresh world has nothing to replay onto, so it is saved straight
+        away and any old journal is dropped. A replayed journal, or one cut
+        short by a crash, is folded into a new save, so later commands are
+        never appended after a torn line.
+        """
+
+        journal = Journal(Gamebuilder.journal_path(game.hero.name), every)
+        if seq is None:
+            game.journal = journal
+            Gamebuilder.save_game(game)
+            return
+
+        journal.seq = seq
+        renderer, game.renderer = game.renderer, renderers.NullRenderer()
+        for entry, cmd, arg in journal.read(after=seq):
+            game(cmd, arg)
+            journal.seq = entry
+            journal.pending += 1
+        game.renderer = renderer
+        game.journal = journal
+        if not journal.empty:
+            Gamebuilder.save_game(game)
+
+    @staticmethod
+    def _find_hero(data, player_name):
+        """the room a player is in, for saves which do not say"""
+
+        for name, room in data["rooms"].items():
+            if player_name in room["players"]:
+                return name
+        raise KeyError(player_name)
+
+    @staticmethod
+    def make_game(data, lazy=False):
+        """Instantiate the rooms, players and items of saved or new data
+
+        With `lazy` nothing is instantiated yet; rooms are built from their
+        records as they are looked up in a `LazyRooms`.
+        """
+
+        Gamebuilder.templates = Gamebuilder._load_templates(
+            data.get("templates", {})
+        )
 
         game = Game()
         setattr(game, "maze", data["maze"])
+        if lazy:
+            game.rooms = LazyRooms(
+                data["rooms"], Gamebuilder.templates, Gamebuilder._lazy_room,
+                game.players
+            )
+            return game
+
         setattr(game, "rooms", Gamebuilder._make_rooms(data["rooms"]))
 
         Gamebuilder._place_players(game)
         Gamebuilder._make_paths(game)
-
-        for player in Player.instances:
-            if player.name == player_name:
-                hero = player
-
-        game.hero = hero
-        game.maze[hero.location.x][hero.location.y] = MazeFactory.player_color
         return game
 
     @staticmethod
@@ -204,6 +584,7 @@ class Gamebuilder:
         for _, room in game.rooms.items():
             for _, player in room.players.items():
                 player.location = room
+                game.players[player.name] = player
 
     @staticmethod
     def _make_paths(game):
@@ -212,6 +593,11 @@ class Gamebuilder:
                 this_adj = getattr(room, direction)
                 setattr(room, direction, game.rooms.get(this_adj, None))
 
+    @staticmethod
+    def _lazy_room(templates, record):
+        Gamebuilder.templates = templates
+        return Gamebuilder._rec_inst(Room, **record)
+
     @staticmethod
     def _make_rooms(rooms):
         for name, room in rooms.items():
@@ -219,8 +605,21 @@ class Gamebuilder:
             rooms[name] = new_room
         return rooms
 
+    @staticmethod
+    def _load_templates(templates):
+        out = {}
+        for ref, template in templates.items():
+            fixed = dict(template)
+            out[ref] = ItemTemplate.get(
+                fixed.pop("type"), fixed.pop("description"), fixed
+            )
+        return out
+
     @staticmethod
     def _rec_inst(clz, **data):
+        if clz is Item:
+            return Item.from_record(Gamebuilder.templates, **data)
+
         new_obj = clz()
         for key, val in data.items():
             if key in Gamebuilder.dict_factories:
@@ -237,30 +636,117 @@ class Gamebuilder:
         return new_obj
 
     @staticmethod
-    def load_game(player):
-        """Load the save file associated with player"""
-
-        save_files = []
-        with os.scandir("./dork/saves") as saves:
-            for entry in saves:
-                save_files.append(entry.name.strip(".yml"))
-        if player in save_files:
-            file_path = f"./dork/saves/{player}.yml"
-            with open(file_path) as file:
-                data = yaml.safe_load(file.read())
-        else:
-            data = {}
+    def save_path(player, save_format="yaml"):
+        """where a player's save in one format lives"""
+
+        suffix = saves.BACKENDS[save_format].suffix
+        return os.path.join(Gamebuilder.save_dir, player + suffix)
+
+    @staticmethod
+    def load_game(player, lazy=False):
+        """Load the save file associated with player
+
+        The save index says which file to read. Saves it does not know
+        about are looked for in every format, newest first, and indexed.
+        `lazy` is handed on to the save backend.
+        """
+
+        index = saves.SaveIndex(Gamebuilder.save_dir)
+        entry = index.lookup(player)
+        if entry is not None:
+            path = Gamebuilder.save_path(player, entry["format"])
+            try:
+                return saves.build(entry["format"]).load(path, lazy)
+            except FileNotFoundError:
+                index.forget(player)
+
+        found = []
+        for save_format in saves.BACKENDS:
+            try:
+                path = Gamebuilder.save_path(player, save_format)
+                found.append((os.stat(path).st_mtime, save_format, path))
+            except FileNotFoundError:
+                continue
+        if not found:
+            return {}
+
+        mtime, save_format, path = max(found)
+        data = saves.build(save_format).load(path, lazy)
+        index.record(
+            player, save_format,
+            data.get("header") or saves.header(data, mtime)
+        )
         return data
 
     @staticmethod
     def save_game(game):
-        """Save a game instance to a yaml file if it exists, else create one"""
+        """Save a game instance in its save format
+
+        A full save covers everything journaled so far, so the journal is
+        emptied once the save is safely written. Any autosave still being
+        written is finished first, so it cannot land on top of this one.
+        """
+
+        if game.autosave is not None:
+            game.autosave.wait()
+        file_name = Gamebuilder.write_save(
+            game.hero.name, game.save_format, Gamebuilder.save_data(game)
+        )
+        if game.journal is not None:
+            game.journal.reset()
+
+        name = os.path.basename(file_name)
+        return f"Your game was successfully saved as {name}!"
+
+    @staticmethod
+    def write_save(player, save_format, data):
+        """Write save data and index it, returning the file written
+
+        A save made without a journal is newer than anything a journal
+        left from an earlier game holds, so that journal is removed.
+        """
+
+        data["rooms"] = dict(data["rooms"])
+        data["header"] = saves.header(data)
+        file_name = Gamebuilder.save_path(player, save_format)
+        saves.build(save_format).dump(data, file_name)
+        saves.SaveIndex(Gamebuilder.save_dir).record(
+            player, save_format, data["header"]
+        )
+        if "journal" not in data:
+            try:
+                os.remove(Gamebuilder.journal_path(player))
+            except FileNotFoundError:
+                pass
+        return file_name
+
+    @staticmethod
+    def snapshots(game):
+        """Copy-on-write snapshots of a game's save data"""
+
+        return Snapshots(
+            game, Gamebuilder._room_data, Gamebuilder._raw_room_data
+        )
+
+    @staticmethod
+    def save_data(game):
+        """The nested dict a game is saved as"""
+
+        data = Gamebuilder.snapshots(game).take()
+        data["rooms"] = dict(data["rooms"])
+        return data
+
+    @staticmethod
+    def _room_data(room, item_data):
+        """the saved form of a room, with items saved by item_data"""
 
         def _rec_data(data):
             out = {}
             for key, val in data.items():
-                if isinstance(val, (Item, Player)):
-                    out[key] = _rec_data(vars(val))
+                if isinstance(val, Item):
+                    out[key] = item_data(val)
+                elif isinstance(val, Player):
+                    out[key] = _rec_data(attrs(val))
                 elif isinstance(val, dict):
                     out[key] = _rec_data(val)
                 elif isinstance(val, Room):
@@ -269,60 +755,95 @@ class Gamebuilder:
                     out[key] = val
             return out
 
-        data = {
-            "maze": game.maze,
-            "rooms": {}
-        }
+        new_room = {}
+        new_room["adjacent"] = {}
+        new_room["coordinates"] = {}
+        for key, val in attrs(room).items():
+            if isinstance(val, dict):
+                new_room[key] = _rec_data(val)
+            elif key in Gamebuilder.cardinals:
+                this_adj = val.name if isinstance(val, Room) else val
+                new_room["adjacent"][key] = this_adj
+            elif key in ["x", "y"]:
+                new_room["coordinates"][key] = val
+            else:
+                new_room[key] = val
+        return new_room
 
-        for name, room in game.rooms.items():
-            new_room = {}
-            new_room["adjacent"] = {}
-            new_room["coordinates"] = {}
-            for key, val in vars(room).items():
-                if isinstance(val, dict):
-                    new_room[key] = _rec_data(val)
-                elif key in Gamebuilder.cardinals:
-                    this_adj = val.name if val else None
-                    new_room["adjacent"][key] = this_adj
-                elif key in ["x", "y"]:
-                    new_room["coordinates"][key] = val
-                else:
-                    new_room[key] = val
-            data["rooms"][name] = new_room
-
-        file_name = f"./dork/saves/{game.hero.name}.yml"
-        with open(file_name, "w") as save_file:
-            yaml.safe_dump(
-                data, save_file,
-                indent=4, width=80,
-            )
+    @staticmethod
+    def _raw_room_data(record, item_data):
+        """the saved form of a room record, with its items templated"""
+
+        def _items(inventory):
+            return {
+                name: item if "template" in item else item_data(
+                    Item.from_record(**item)
+                ) for name, item in inventory.items()
+            }
 
-        return f"Your game was successfully saved as {game.hero.name}.yml!"
+        out = dict(record)
+        out["inventory"] = _items(record["inventory"])
+        out["players"] = {
+            name: {**player, "inventory": _items(player["inventory"])}
+            for name, player in record["players"].items()
+        }
+        return out
 
 
 class Game:
     """An instance of Dork"""
 
     verbose = False
+    interactive = True
+    save_format = "yaml"
+    journal = None
+    autosave = None
+    stats = None
     dataaa = {}
 
     def __init__(self):
         self.maze = []
         self.rooms = {}
+        self.players = {}
         self.hero = Player()
+        self.renderer = renderers.MatplotlibRenderer()
 
     def __call__(self, cmd, arg):
+        if self.stats is not None:
+            return self.stats.time(self._call, cmd, arg)
+        return self._call(cmd, arg)
+
+    def _call(self, cmd, arg):
+        before = self.hero.location
         do_func = getattr(self, cmd)
-        func_args = argspec(do_func).args
         if arg:
-            if not func_args or ("self" in func_args and len(func_args) == 1):
-                out = self._repl_error("This command takes no arguments")
+            takes_arg = Game.arity.get(cmd)
+            if takes_arg is None:
+                takes_arg = Game.arity[cmd] = arity(do_func)
+            if not takes_arg:
+                out = self._repl_error(game_data.ERRS["no args"][1])
             else:
                 out = do_func(arg)
         else:
             out = do_func()
+
+        if self.journal is not None and cmd in game_data.JOURNALED:
+            self.journal.append(cmd, arg)
+            if self.journal.due:
+                Gamebuilder.save_game(self)
+        if self.autosave is not None and cmd in game_data.JOURNALED:
+            self.autosave.touch(before, self.hero.location)
         return out
 
+    def close(self):
+        """Finish any autosave, write any stats and close the renderer"""
+
+        if self.autosave is not None:
+            self.autosave.close()
+        if self.stats is not None and self.stats.path:
+            self.stats.dump()
+        self.renderer.close()
+
     def _toggle_verbose(self) -> (str, bool):
         self.verbose = not self.verbose
         out = {
@@ -335,21 +856,35 @@ class Game:
         return f"\nThanks for playing DORK, {self.hero.name}!", True
 
     def _draw_maze(self):
-        MazeFactory.draw(self.maze)
+        hero = self.hero.location
+        self.renderer.draw(self.maze, (hero.x, hero.y))
         return "\b", False
 
     def _move(self, cardinal):
-        return self.hero.move(cardinal, self.maze), False
+        out = self.hero.move(cardinal, self.maze, self.renderer)
+        if isinstance(self.rooms, LazyRooms):
+            self.rooms.link(self.hero.location)
+        return out, False
 
-    def _examine(self):
-        return self.hero.location.get_items(
-            self.hero.location.name, self.verbose
-        ), False
+    def _examine(self, page=None):
+        return self._list_items(
+            self.hero.location, self.hero.location.name, page
+        )
 
-    def _inventory(self):
-        return self.hero.get_items(
-            self.hero.name, self.verbose
-        ), False
+    def _inventory(self, page=None):
+        return self._list_items(self.hero, self.hero.name, page)
+
+    def _list_items(self, holder, caller, page):
+        """one page of a holder's items, as in `examine 2` or `i --page 2`"""
+
+        number = "1" if page is None else page.split()[-1]
+        if number in ("page", "--page"):
+            number = "1"
+        try:
+            number = int(number)
+        except ValueError:
+            return f"There is no page {page}.", False
+        return holder.get_items(caller, self.verbose, number), False
 
     def _look(self):
         return self.hero.location.description, False
@@ -361,18 +896,42 @@ class Game:
         return self.hero.location._drop(self.hero, item_name)
 
     def _start_over(self):
+        if not self.interactive:
+            return "new game", False
         return self._confirm(), False
 
     def _save_game(self):
         return Gamebuilder.save_game(self), False
 
+    @staticmethod
+    def _list_saves():
+        listing = saves.SaveIndex(Gamebuilder.save_dir).listing()
+        if not listing:
+            return "There are no saved games.", False
+
+        out = "Saved games:"
+        for entry in listing:
+            played = time.strftime(
+                "%Y-%m-%d %H:%M", time.localtime(entry["last_played"])
+            )
+            out += (
+                f"\n    {entry['player']}: {entry['width']}x"
+                f"{entry['height']}, {entry['rooms']} rooms, "
+                f"last played {played}"
+            )
+        return out, False
+
+    def _show_stats(self):
+        if self.stats is None:
+            return "Command stats are off; start with --stats.", False
+        return self.stats.report(), False
+
     @staticmethod
     def _verbose_print(data):
-        out = ""
         spc = "    "
-        for key, val in data.items():
-            out += "\n" + spc*2 + f"{key}: {val}"
-        return out
+        return "".join(
+            "\n" + spc*2 + f"{key}: {val}" for key, val in data.items()
+        )
 
     @staticmethod
     def _confirm():
@@ -401,274 +960,12 @@ class Game:
         return "holy *%&#@!!! a wild zork appeared!", False
 
 
-class ItemFactory:
-    """Generates a random named item with randomized stats"""
-
-    items = factory_data.ITEMS
-    names = factory_data.NAMES
-    sequence = factory_data.SEQUENCE
-
-    types = items["types"]
-    condition = items["condition"]
-    material = items["material"]
-
-    posessive = names["posessive"]
-    nonposessive = names["nonposessive"]
-    suffixes = names["suffixes"]
-    abstract = names["abstract"]
-    adjectives = names["adjectives"]
-
-    @staticmethod
-    def build(weights=None):
-        """generate a random item"""
-
-        weights = {
-            "player": [8, 0, 0, 7, 5, 10]
-        }.get(weights, [8, 35, 3, 7, 5, 10])
-
-        item_type = choice(choices(
-            population=list(ItemFactory.types.keys()),
-            weights=weights,
-            k=len(list(ItemFactory.types.keys()))
-        ))
-
-        item_name = choice(choices(
-            population=ItemFactory.types[item_type],
-            k=len(ItemFactory.types[item_type])
-        ))
-
-        return ItemFactory._forge(item_name, item_type)
-
-    @staticmethod
-    def _generate(stats, item_name, item_type):
-        return {
-            "name": item_name,
-            "type": item_type,
-            "description": "",
-            "stats": stats
-        }
-
-    @staticmethod
-    def _stats(item_name, item_type):
-        stats = factory_data.stats(item_type.split()[0])
-        return ItemFactory._generate(stats, item_name, item_type)
-
-    @staticmethod
-    def _forge(item_name, item_type):
-        new_name = []
-        build = ItemFactory.sequence[item_type]
-
-        seq = choice(choices(
-            population=build["seq"],
-            weights=build["w"],
-            k=len(build["seq"])
-        ))
-
-        for lists in seq:
-            if isinstance(lists, dict):
-                this_list = lists.get(
-                    item_type, lists.get("usable", ['']))
-            elif lists:
-                this_list = lists
-            else:
-                this_list = ['']
-
-            this_word = choice(choices(
-                population=this_list,
-                k=len(this_list)
-            ))
-
-            if this_word:
-                if this_word in ItemFactory.suffixes:
-                    new_name[-1] += this_word
-                    item_type = f"legendary {item_name}"
-                else:
-                    new_name.append(this_word)
-            else:
-                new_name.append(item_name)
-
-        item_name = " ".join(new_name)
-        return ItemFactory._stats(item_name, item_type)
-
-
-class PlayerFactory:
-    """Generate players for a room"""
-
-    @staticmethod
-    def build(i, room):
-        """Make a player, give them items"""
-
-        new_player = {
-            "name": f"player {i}",
-            "description": f"player {i} description",
-            "location": room["name"],
-            "inventory": {},
-            "equipped": []
-        }
-
-        for _ in range(randint(1, 3)):
-            new_item = ItemFactory.build("player")
-            item_name = new_item.pop("name")
-            if new_item["stats"]["equipable"]:
-                new_player["equipped"].append(item_name)
-
-            new_player["inventory"][item_name] = new_item
-        return new_player
-
-
-class RoomFactory:
-    """Generate rooms for a given maze"""
-
-    #  N, S and E, W are backwards because numpy uses column-order
-    moves = {
-        "north": (1, 0), "south": (-1, 0),
-        "east": (0, 1), "west": (0, -1),
-    }
-
-    @staticmethod
-    def build(maze, rooms):
-        """build a room"""
-
-        RoomFactory.maze = maze
-        RoomFactory.rooms = rooms
-        RoomFactory.worldmap = {}
-        return RoomFactory._make_rooms()
-
-    @staticmethod
-    def _make_rooms():
-        i = 0
-        for room in RoomFactory.rooms:
-            x, y = room
-            new_room = {
-                "name": f"room {i}",
-                "description": f"room {i} description",
-                "coordinates": {
-                    "x": x,
-                    "y": y,
-                },
-                "adjacent": {},
-                "players": {},
-                "inventory": {},
-            }
-
-            for _ in range(randint(1, 7)):
-                new_item = ItemFactory.build()
-                new_room["inventory"][new_item.pop("name")] = new_item
-
-            for _ in range(randint(0, 2)):
-                new_player = PlayerFactory.build(i, new_room)
-                new_room["players"][new_player["name"]] = new_player
-
-            RoomFactory.worldmap[room] = new_room
-            i += 1
-
-        return RoomFactory._get_adj()
-
-    @staticmethod
-    def _get_adj():
-        for coord, room in RoomFactory.worldmap.items():
-            for direction in RoomFactory.moves:
-                searching = True
-                position = coord
-                while searching:
-                    position = tuple(
-                        map(
-                            add, position, RoomFactory.moves[direction]
-                        )
-                    )
-                    if RoomFactory.maze[position] == MazeFactory.wall_color:
-                        room["adjacent"][direction] = None
-                        searching = False
-                    elif RoomFactory.maze[position] in \
-                            [MazeFactory.room_color, MazeFactory.player_color]:
-                        room["adjacent"][direction] = \
-                            RoomFactory.worldmap[position]["name"]
-                        searching = False
-
-        for coord, room in deepcopy(RoomFactory.worldmap).items():
-            new_room = RoomFactory.worldmap.pop(coord)
-            RoomFactory.worldmap[new_room["name"]] = new_room
-
-        return RoomFactory.worldmap
-
-
-class MazeFactory:
-    """Generate a maze with rooms on intersections, corners, and dead-ends"""
-
-    wall_color, path_color, room_color, player_color = (-2, 2, 1, 0)
-    moves = factory_data.MOVES
-    rules = factory_data.rules(wall_color, path_color)
-
-    @staticmethod
-    def draw(maze):
-        """display the maze"""
-
-        plt.figure(figsize=(len(maze[0])//2, len(maze)//2))
-        plt.pcolormesh(maze, cmap=plt.cm.get_cmap("tab20b"))
-        plt.axis("equal")
-        plt.axis("off")
-        plt.ion()
-        plt.show()
-
-    @staticmethod
-    def update(maze):
-        """update the maze display"""
-
-        plt.pcolormesh(maze, cmap=plt.cm.get_cmap("tab20b"))
-        plt.axis("equal")
-        plt.axis("off")
-        plt.draw()
-
-    # pylint: disable=R0914
-    @staticmethod
-    def build():
-        """generate a maze"""
-
-        x = choice([10, 12, 14, 18])
-        y = 148//x
-
-        maze = npf((x+1, y+1), MazeFactory.wall_color)
-        grid = [(i, j) for i in range(1, x+1, 2) for j in range(1, y+1, 2)]
-        path = [choice(grid)]
-        rooms = []
-        position = path[0]
-        grid.remove(position)
-
-        while grid:
-            n = len(path)
-            nsew = []
-            for move in MazeFactory.moves:
-                nsew.append([
-                    tuple(map(add, move[0], position)),
-                    tuple(map(add, move[1], position))
-                ])
-            shuffle(nsew)
-            for probe in nsew:
-                if probe[0] in grid:
-                    maze[probe[0]] = MazeFactory.path_color
-                    maze[probe[1]] = MazeFactory.path_color
-                    grid.remove(probe[0])
-                    path.extend(probe)
-                    break
-            if n == len(path):
-                position = path[max(path.index(position)-1, 1)]
-            else:
-                position = path[-1]
-
-        for coord in path:
-            i, j = coord
-            neighbors = [
-                maze[i-1, j],
-                maze[i+1, j],
-                maze[i, j-1],
-                maze[i, j+1]
-            ]
-            if neighbors in MazeFactory.rules:
-                rooms.append(coord)
-                maze[coord] = MazeFactory.room_color
-            maze[rooms[0]] = MazeFactory.player_color
-
-        return {
-            "maze": maze.tolist(),
-            "rooms": RoomFactory.build(maze, rooms)
-        }
+#  handler arities, worked out once for every command in game_data
+Game.arity = {
+    entry[0]: arity(getattr(Game, entry[0]))
+    for table in [
+        game_data.CMDS, game_data.MOVES, game_data.META, game_data.ERRS
+    ]
+    for call in table.values()
+    for entry in (call.values() if isinstance(call, dict) else [call])
+}
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """Pytest Fixtures for Dork unit-tests"""
 import pytest
-import dork
+import dork.repl
+# pylint: disable=protected-access
 
 
 pytest_plugins = ["pytester"]  # pylint: disable=invalid-name
@@ -25,12 +26,32 @@ def room():
     return dork.types.Room()
 
 
+@pytest.fixture(autouse=True)
+def save_dir(tmp_path, monkeypatch):
+    """Every test saves to its own directory, never to ./dork/saves"""
+    monkeypatch.setattr(dork.types.Gamebuilder, "save_dir", str(tmp_path))
+    return tmp_path
+
+
 @pytest.fixture
-def game():
+def game(save_dir):  # pylint: disable=redefined-outer-name,unused-argument
     """A basic dork game fixture"""
     return dork.types.Gamebuilder.build("tester")
 
 
+@pytest.fixture
+def wander():
+    """Walk a game through open doors, picking up whatever lies around"""
+    def _wander(world, steps=1):
+        for _ in range(steps):
+            for cardinal in ["north", "east", "south", "west"]:
+                if getattr(world.hero.location, cardinal):
+                    dork.repl._evaluate(cardinal, world)
+                    dork.repl._evaluate("take", world)
+                    break
+    return _wander
+
+
 @pytest.fixture
 def cardinals():
     """A fixture of the cardinal directions"""
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Tests for background autosaves"""
+
+
+from copy import deepcopy
+from dork import types
+# pylint: disable=protected-access
+
+
+def test_snapshots_copy_on_write(game, wander):
+    """a snapshot never changes and shares what did not change"""
+
+    snapshots = types.Gamebuilder.snapshots(game)
+    first = snapshots.take()
+    frozen = deepcopy(first)
+    start = game.hero.location.name
+
+    wander(game)
+    snapshots.touch(game.rooms[start], game.hero.location)
+    second = snapshots.take()
+
+    assert first == frozen
+    assert second["hero"] != first["hero"]
+    assert second["maze"] == game.maze
+    assert second["rooms"][start] is not first["rooms"][start]
+    untouched = [
+        name for name in game.rooms
+        if name not in (start, game.hero.location.name)
+    ]
+    assert all(
+        second["rooms"][name] is first["rooms"][name] for name in untouched
+    )
+
+
+def test_autosave_every_n_changes(wander):
+    """the game saves itself in the background after every N changes"""
+
+    game = types.Gamebuilder.build("auto", seed=11, options={"autosave": 4})
+    for _ in range(2):
+        wander(game)
+    game.autosave.wait()
+
+    saved = types.Gamebuilder.load_game("auto")
+    assert saved["hero"] == game.hero.location.name
+    assert sorted(saved["rooms"][saved["hero"]]["players"]["auto"][
+        "inventory"
+    ]) == sorted(game.hero.inventory)
+    game.close()
+
+
+def test_autosave_lazy_binary(save_dir):
+    """untouched rooms of a lazy binary save are written from the file"""
+
+    game = types.Gamebuilder.build(
+        "lazy", seed=11, options={"save_format": "binary"}
+    )
+    game._save_game()
+    full = types.Gamebuilder.save_data(game)
+
+    lazy = types.Gamebuilder.build("lazy", options={
+        "lazy": True, "autosave": 100, "save_format": "binary"
+    })
+    assert len(lazy.autosave.snapshots.rooms) < len(lazy.rooms)
+    lazy.autosave.save()
+    lazy.close()
+
+    assert (save_dir / "lazy.dork").exists()
+    assert types.Gamebuilder.load_game("lazy")["rooms"] == full["rooms"]
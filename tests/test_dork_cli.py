@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """Basic tests for the dork cli"""
 
+import io
 from types import FunctionType
 import dork.cli
 
@@ -29,3 +30,55 @@ def test_cli_unknown(run):
     assert 'Greetings' in out
     assert err == ""
     assert mocked_input.call_count == 2
+
+
+def test_cli_script(tmp_path, capsys, mocker):
+    """scripts run without input() and report their throughput"""
+
+    mocked_input = mocker.patch("builtins.input")
+    script = tmp_path / "walk.txt"
+    script.write_text("# a short walk\nN\nlook\n.new\ni\n.rq\nlook\n")
+    dork.cli.main("dork", "--script", str(script), "--seed", "5")
+
+    captured = capsys.readouterr()
+    assert mocked_input.call_count == 0
+    assert "> n\n" in captured.out and "> look\n" in captured.out
+    assert captured.out.count("Greetings, scripted!") == 2
+    assert "Thanks for playing DORK" in captured.out
+    assert captured.out.endswith("Thanks for playing DORK, scripted!\n\n")
+    assert captured.err.startswith("5 commands in ")
+
+
+def test_cli_script_stdin(capsys, mocker):
+    """a script of - is read from stdin"""
+
+    mocker.patch("sys.stdin", io.StringIO("i\n.z\n"))
+    dork.cli.main("dork", "--script", "-", "--player", "piped")
+    captured = capsys.readouterr()
+    assert "Greetings, piped!" in captured.out
+    assert "a wild zork appeared" in captured.out
+    assert "2 commands" in captured.err
+
+
+def test_cli_pool_by_default(run, mocker):
+    """new worlds come from a pool unless scripted or --pool 0"""
+
+    pool = mocker.patch("dork.cli.WorldPool")
+    pool.return_value.start.return_value.take.side_effect = (
+        lambda: dork.types.MazeFactory.build(10, seed=1)
+    )
+    run(dork.cli.main, "dork", input_side_effect=["tester", ".rq"])
+    assert pool.call_args[0][0] == 1
+
+    pool.reset_mock()
+    run(dork.cli.main, "dork", "--pool", "0",
+        input_side_effect=["tester", ".rq"])
+    assert not pool.called
+
+    mocker.patch("sys.stdin", io.StringIO(".rq\n"))
+    dork.cli.main("dork", "--script", "-")
+    assert not pool.called
+
+    mocker.patch("sys.stdin", io.StringIO(".rq\n"))
+    dork.cli.main("dork", "--script", "-", "--pool", "2")
+    assert pool.call_args[0][0] == 2
@@ -2,6 +2,7 @@
 """Basic tests for state and entity relationships in dork"""
 
 
+import shutil
 from dork import repl, cli, types
 # pylint: disable=protected-access
 
@@ -82,18 +83,23 @@ def test_new_game_command(run):
     assert mocked_input.call_count == 5
 
 
-def test_repl_load_game():
+def test_repl_load_game(save_dir):
     """test repl with existing save file"""
 
+    shutil.copy("./dork/saves/devon.yml", save_dir / "devon.yml")
     game = repl._new_game("devon")
     assert isinstance(game, types.Game)
 
 
-def test_repl_save_game():
+def test_repl_save_game(save_dir):
     """test save function"""
 
+    shutil.copy("./dork/saves/devon.yml", save_dir / "devon.yml")
     game = repl._new_game("devon")
     repl._evaluate(".save", game)
+    assert types.Gamebuilder.load_game("devon")["header"]["rooms"] == len(
+        game.rooms
+    )
 
 
 def test_repl_evaluate_safety(game):
@@ -121,3 +127,26 @@ def test_repl_bad_keys(game):
     assert repl._evaluate("take LARSEN", game) == (
         "There is no LARSEN here.", False
     )
+
+
+def test_repl_parse_table():
+    """lines resolve straight to a handler and its argument"""
+
+    assert repl._parse("n") == ("_move", "north")
+    assert repl._parse("go  west") == (
+        "_repl_error", "Um. Where are you trying to go?"
+    )
+    assert repl._parse("walk west") == ("_move", "west")
+    assert repl._parse("take red herring") == ("_take_item", "red herring")
+    assert repl._parse("look around") == (
+        "_repl_error", "This command takes no arguments"
+    )
+    assert repl._parse("take take")[1].startswith("A command so nice")
+    assert set(types.Game.arity) >= {
+        entry[0] for entry in repl._TABLE.values() if isinstance(entry, tuple)
+    }
+
+    repl._parse.cache_clear()
+    for _ in range(3):
+        repl._parse(".m")
+    assert repl._parse.cache_info().hits == 2
@@ -2,7 +2,8 @@
 
 
 from random import choice
-from dork import repl
+from dork import repl, types
+from dork.game_utils import seeding
 # pylint: disable=protected-access
 
 
@@ -64,3 +65,73 @@ def test_take_item_not_in_room(game):
 
     no_take = repl._evaluate(f"take larsen", game)
     assert no_take == ("There is no larsen here.", False)
+
+
+def test_paged_listing(game):
+    """big inventories are listed a page at a time, cached until changed"""
+
+    room = game.hero.location
+    room.inventory.clear()
+    for i in range(45):
+        room.inventory[f"pebble {i:02}"] = types.Item()
+
+    first = repl._evaluate("examine", game)[0]
+    assert "pebble 00" in first and "pebble 20" not in first
+    assert first.endswith("(page 1 of 3)")
+    assert repl._evaluate("examine 3", game)[0].count("pebble") == 5
+    assert repl._evaluate("examine 4", game)[0] == (
+        "There is no page 4, only 3."
+    )
+    assert room.get_items("", False, None).count("pebble") == 45
+
+    cached = room._listed
+    assert repl._evaluate("examine", game)[0] == first
+    assert room._listed is cached
+    repl._evaluate("take pebble 01", game)
+    assert "pebble 20" in repl._evaluate("examine", game)[0]
+    assert "pebble 01" in repl._evaluate("i --page 1", game)[0]
+    assert repl._evaluate("i two", game)[0] == "There is no page two."
+    assert repl._evaluate("i --page", game)[0] == (
+        repl._evaluate("i --page 1", game)[0]
+    )
+    assert repl._evaluate("examine --page", game)[0] == (
+        repl._evaluate("examine", game)[0]
+    )
+
+
+def test_filtered_take_and_drop(game):
+    """take all and drop all move every item of a type or stat at once"""
+
+    room, hero = game.hero.location, game.hero
+    room.inventory.clear()
+    loot = seeding.Seeds(25).stream("loot")
+    for record in types.ItemFactory.build_many(300, rng=loot):
+        room.inventory[record.pop("name")] = types.Item.from_record(**record)
+    weapons = {
+        name for name, item in room.inventory.items() if item.type == "weapon"
+    }
+    lucky = {
+        name for name, item in room.inventory.items()
+        if item.luck is not None and item.luck > 10
+    }
+
+    out = repl._evaluate("take all weapon", game)[0]
+    assert set(hero.inventory) == weapons
+    assert not weapons & set(room.inventory)
+    assert out.startswith("You took ") and "more" in out
+
+    repl._evaluate("drop all", game)
+    assert not hero.inventory
+    repl._evaluate("take all luck>10", game)
+    assert set(hero.inventory) == lucky
+    assert repl._evaluate("take all luck>10", game) == (
+        "There is no luck>10 here.", False
+    )
+    assert repl._evaluate("drop all larsen", game) == (
+        "There is no larsen in your inventory.", False
+    )
+
+    version = room.inventory.version
+    repl._evaluate("drop all", game)
+    assert room.inventory.version > version
+    assert not hero.inventory
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Tests for the command journal"""
+
+
+from dork import types
+from dork.game_utils.journal import Journal
+# pylint: disable=protected-access
+
+
+def test_journal_skips_saved_and_torn_entries(tmp_path):
+    """replay starts after the save and stops at a half-written line"""
+
+    journal = Journal(str(tmp_path / "j.journal"))
+    for cardinal in ["north", "south", "east"]:
+        journal.append("_move", cardinal)
+    with open(journal.path, "a", encoding="utf-8") as torn:
+        torn.write('[4, "_mo')
+
+    assert journal.read(after=1) == [
+        (2, "_move", "south"), (3, "_move", "east")
+    ]
+
+
+def test_crashed_game_is_recovered(save_dir, wander):
+    """a game which was never saved comes back from its journal"""
+
+    game = types.Gamebuilder.build("crash", seed=7, options={"journal": 100})
+    assert (save_dir / "crash.yml").exists()
+
+    wander(game, 6)
+    assert game.journal.pending == 12
+
+    recovered = types.Gamebuilder.build("crash", options={"journal": 100})
+    assert recovered.hero.location.name == game.hero.location.name
+    assert sorted(recovered.hero.inventory) == sorted(game.hero.inventory)
+    assert recovered.maze == game.maze
+    assert isinstance(recovered.renderer, type(game.renderer))
+
+
+def test_journal_compacts_into_a_save(wander):
+    """every N journaled commands the game is saved and the journal emptied"""
+
+    game = types.Gamebuilder.build("compact", seed=7, options={"journal": 4})
+    wander(game, 3)
+
+    assert game.journal.seq == 6
+    assert game.journal.read() == game.journal.read(after=4)
+    assert len(game.journal.read()) == 2
+    assert types.Gamebuilder.load_game("compact")["journal"] == 4
+
+    recovered = types.Gamebuilder.build("compact", options={"journal": 4})
+    assert recovered.hero.location.name == game.hero.location.name
+    assert recovered.journal.seq == 6
+
+
+def test_unjournaled_save_drops_the_journal(save_dir, wander):
+    """a journal older than the save is not replayed over it"""
+
+    game = types.Gamebuilder.build("stale", seed=7, options={"journal": 100})
+    wander(game, 3)
+    assert game.journal.read()
+
+    later = types.Gamebuilder.build("stale")
+    later._save_game()
+    assert not (save_dir / "stale.journal").exists()
+
+    recovered = types.Gamebuilder.build("stale", options={"journal": 100})
+    assert recovered.hero.location.name == later.hero.location.name
+    assert sorted(recovered.hero.inventory) == sorted(later.hero.inventory)
+
+
+def test_journal_recovers_after_a_torn_line(save_dir, wander):
+    """commands after a recovered crash are not lost to the torn line"""
+
+    game = types.Gamebuilder.build("torn", seed=7, options={"journal": 100})
+    wander(game, 4)
+    with open(save_dir / "torn.journal", "a", encoding="utf-8") as torn:
+        torn.write('[99, "_mo')
+
+    recovered = types.Gamebuilder.build("torn", options={"journal": 100})
+    assert recovered.hero.location.name == game.hero.location.name
+    wander(recovered, 3)
+    assert len(recovered.journal.read()) == 6
+
+    again = types.Gamebuilder.build("torn", options={"journal": 100})
+    assert again.hero.location.name == recovered.hero.location.name
+    assert sorted(again.hero.inventory) == sorted(recovered.hero.inventory)
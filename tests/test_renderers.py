@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Tests for the dork maze renderers"""
+
+
+import re
+from io import StringIO
+from dork import repl
+from dork.game_utils import renderers
+from dork.game_utils.factory_data import COLORS
+# pylint: disable=protected-access
+
+
+WALL, PATH, ROOM, HERO = (
+    COLORS["wall"], COLORS["path"], COLORS["room"], COLORS["player"]
+)
+
+
+def _corridor(length):
+    """a single east-west corridor with rooms at both ends"""
+
+    maze = [[WALL]*(length+2) for _ in range(3)]
+    maze[1][1:-1] = [HERO] + [PATH]*(length-2) + [ROOM]
+    return maze
+
+
+def test_renderer_registry():
+    """every registered renderer should build by name"""
+
+    for name in renderers.RENDERERS:
+        assert isinstance(renderers.build(name), renderers.Renderer)
+
+
+def test_terminal_update_repaints_changed_cells():
+    """after the first draw only the two changed cells are written"""
+
+    stream = StringIO()
+    maze = _corridor(10)
+    terminal = renderers.TerminalRenderer(stream=stream)
+
+    terminal.update(maze, [(1, 1)], (1, 1))
+    assert stream.getvalue() == ""
+
+    terminal.draw(maze, (1, 1))
+    stream.truncate(0)
+    stream.seek(0)
+
+    maze[1][1], maze[1][10] = ROOM, HERO
+    terminal.update(maze, [(1, 1), (1, 10)], (1, 10))
+    out = stream.getvalue()
+    assert len(re.findall(r"\x1b\[\d+;\d+H", out)) == 2
+    assert terminal.glyphs[HERO] in out
+    assert terminal.glyphs[ROOM] in out
+
+
+def test_terminal_viewport_follows_hero():
+    """the viewport re-centres when the hero reaches its edge"""
+
+    stream = StringIO()
+    maze = _corridor(100)
+    terminal = renderers.TerminalRenderer(stream=stream, viewport=(10, 3))
+    terminal.draw(maze, (1, 1))
+    assert terminal.window == (0, 0, 3, 10)
+    assert stream.getvalue().count(terminal.glyphs[WALL]) == 21
+
+    maze[1][1], maze[1][100] = ROOM, HERO
+    terminal.update(maze, [(1, 1), (1, 100)], (1, 100))
+    assert terminal.window == (0, 92, 3, 10)
+
+
+def test_game_renders_through_its_renderer(game):
+    """moving the hero should only touch the game's renderer"""
+
+    stream = StringIO()
+    game.renderer = renderers.TerminalRenderer(stream=stream)
+    assert repl._evaluate(".m", game) == ("\b", False)
+    drawn = len(stream.getvalue())
+
+    for cardinal in ["north", "south", "east", "west"]:
+        if getattr(game.hero.location, cardinal):
+            repl._evaluate(cardinal, game)
+            break
+    assert 0 < len(stream.getvalue()) - drawn < drawn
+
+
+def test_matplotlib_reuses_one_mesh(game):
+    """moves update the existing mesh instead of stacking new artists"""
+
+    game.renderer = renderers.MatplotlibRenderer(interval=0)
+    repl._evaluate(".m", game)
+    mesh = game.renderer.mesh
+
+    for _ in range(10):
+        for cardinal in ["north", "south", "east", "west"]:
+            repl._evaluate(cardinal, game)
+
+    hero = game.hero.location
+    assert list(game.renderer.axes.collections) == [mesh]
+    assert game.renderer.colors[hero.x, hero.y] == HERO
+    assert (game.renderer.colors == game.maze).all()
+    game.renderer.close()
+
+
+def test_matplotlib_coalesces_moves(game, mocker):
+    """moves inside one frame interval share a single redraw"""
+
+    game.renderer = renderers.MatplotlibRenderer(interval=3600)
+    repl._evaluate(".m", game)
+    redraw = mocker.spy(game.renderer, "_redraw")
+    game.renderer.last_frame = float("-inf")
+
+    for cardinal in ["north", "south", "east", "west"]*3:
+        repl._evaluate(cardinal, game)
+
+    assert redraw.call_count == 1
+    assert (game.renderer.colors == game.maze).all()
+    game.renderer.close()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Tests for the parallel headless runner"""
+
+
+from dork.game_utils import runner
+
+
+def test_session_plays_a_script():
+    """a scripted session stops at .rq and leaves nothing behind"""
+
+    result = runner.session(3, script=["look", "take", ".rq", "look"])
+    assert len(result["latencies"]) == 3
+    assert not result["crossed"]
+
+    again = runner.session(4, commands=10)
+    assert len(again["latencies"]) == 10
+    assert again["stale players"] == result["stale players"]
+    assert again["stale rooms"] == result["stale rooms"]
+
+
+def test_run_aggregates_sessions():
+    """sessions are spread over workers and summed up"""
+
+    summary = runner.run(sessions=4, workers=2, commands=25, seed=7)
+    assert summary["sessions"] == 4
+    assert summary["commands"] == 100
+    assert 1 <= summary["workers"] <= 2
+    assert summary["latency us"]["p50"] <= summary["latency us"]["p99"]
+    assert summary["crossed"] == 0
+    assert len(runner.report(summary)) == 4
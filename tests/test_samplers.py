@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Tests for the compiled item samplers"""
+
+
+from collections import Counter
+from dork import types
+from dork.game_utils import factory_data, seeding
+
+
+def test_build_many():
+    """build_many forges n complete items"""
+
+    items = types.ItemFactory.build_many(50)
+    assert len(items) == 50
+    for item in items:
+        assert set(item) == {"name", "type", "description", "stats"}
+        assert item["name"]
+
+
+def test_type_distribution_matches_weights():
+    """item types follow ItemFactory.type_weights"""
+
+    rng = seeding.Seeds(7).stream("loot")
+    for weights, expected in types.ItemFactory.type_weights.items():
+        sampler = types.ItemFactory.sampler(weights)
+        drawn = Counter(
+            item_type.split()[0] if item_type.startswith("legendary")
+            else item_type for _, item_type in sampler.sample(rng, 60000)
+        )
+        drawn["weapon"] += drawn.pop("legendary", 0)
+
+        total = sum(expected)
+        for item_type, weight in zip(factory_data.ITEMS["types"], expected):
+            share = drawn[item_type]/60000
+            assert abs(share - weight/total) < 0.01, item_type
+            if not weight:
+                assert not drawn[item_type]
+
+
+def test_legendary_items_are_weapons():
+    """suffixed names only come from weapon sequences"""
+
+    weapons = factory_data.ITEMS["types"]["weapon"]
+    rng = seeding.Seeds(3).stream("loot")
+    forged = types.ItemFactory.sampler().sample(rng, 5000)
+
+    legendary = [t for _, t in forged if t.startswith("legendary")]
+    assert legendary
+    for item_type in legendary:
+        assert item_type[len("legendary "):] in weapons
+
+
+def test_stat_table_follows_rules():
+    """bulk stats stay inside factory_data.STATS and leave unused as None"""
+
+    table = types.ItemFactory.stat_table()
+    rng = seeding.Seeds(11).stream("stats")
+
+    for stat_type, rules in factory_data.STATS.items():
+        rolled = table.roll(stat_type, 500, rng)
+        assert rolled.dtype.names == table.fields
+        for record in table.records(stat_type, rolled):
+            single = factory_data.stats(stat_type, rng)
+            assert set(record) == set(single)
+            for field, default in factory_data.STAT_DEFAULTS.items():
+                rule = rules.get(field, default)
+                if isinstance(rule, tuple):
+                    assert rule[0] <= record[field] <= rule[1]
+                    assert rule[0] <= single[field] <= rule[1]
+                else:
+                    assert record[field] == single[field] == rule
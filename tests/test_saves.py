@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Tests for the save formats"""
+
+
+import os
+import shutil
+from dork import repl, types
+from dork.game_utils import convert, saves
+# pylint: disable=protected-access
+
+
+def test_backends_round_trip(game):
+    """every backend reads back exactly what it wrote"""
+
+    for record in types.ItemFactory.build_many(3):
+        game.hero.inventory[record["name"]] = types.Item.from_record(
+            **record
+        )
+    data = types.Gamebuilder.save_data(game)
+    for name in saves.BACKENDS:
+        backend = saves.build(name)
+        assert backend.loads(backend.dumps(data)) == data
+
+
+def test_binary_packs_odd_mazes():
+    """maze cells pack four to a byte whatever the maze size"""
+
+    maze = [[-2, 2, 1], [0, 2, -2], [1, 1, 1]]
+    packed = saves.BinaryBackend._pack_maze(maze)
+    assert packed["maze"].nbytes == 3
+    assert saves.BinaryBackend._unpack_maze(packed) == maze
+
+
+def test_save_and_load_binary(game, save_dir):
+    """a game saved in binary loads back through Gamebuilder"""
+
+    game.save_format = "binary"
+    assert game._save_game()[0].endswith("tester.dork!")
+    assert sorted(os.listdir(save_dir)) == ["index.sqlite", "tester.dork"]
+
+    loaded = types.Gamebuilder.build("tester")
+    assert loaded.maze == game.maze
+    assert list(loaded.rooms) == list(game.rooms)
+    assert loaded.hero.location.name == game.hero.location.name
+
+
+def test_convert_all(tmp_path):
+    """a directory of yaml saves is converted to binary in parallel"""
+
+    for name in ["ann", "bob"]:
+        shutil.copy("./dork/saves/devon.yml", tmp_path / f"{name}.yml")
+
+    converted = convert.convert_all(str(tmp_path), workers=2)
+    assert sorted(os.path.basename(path) for path in converted) == [
+        "ann.dork", "bob.dork"
+    ]
+
+    yml = saves.build("yaml").load("./dork/saves/devon.yml")
+    assert "header" not in yml
+    dork = saves.build("binary").load(converted[0])
+    assert dork["maze"] == yml["maze"]
+    assert dork["rooms"].keys() == yml["rooms"].keys()
+
+
+def test_save_index(save_dir):
+    """saves are found and listed through the index alone"""
+
+    shutil.copy("./dork/saves/devon.yml", save_dir / "devon.yml")
+    index = saves.SaveIndex(str(save_dir))
+    assert index.lookup("devon") is None
+
+    assert types.Gamebuilder.load_game("devon")
+    assert index.lookup("devon")["format"] == "yaml"
+
+    game = types.Gamebuilder.build(
+        "devo", seed=3, options={"save_format": "binary"}
+    )
+    game._save_game()
+    assert [entry["player"] for entry in index.listing()] == [
+        "devo", "devon"
+    ]
+    assert index.lookup("devo")["rooms"] == len(game.rooms)
+    assert "devo: " in game._list_saves()[0]
+
+    os.remove(save_dir / "devon.yml")
+    assert types.Gamebuilder.load_game("devon") == {}
+    assert index.lookup("devon") is None
+
+
+def test_save_index_rebuild(tmp_path):
+    """rebuilding reads only save headers, newest format first"""
+
+    shutil.copy("./dork/saves/devon.yml", tmp_path / "dev.yml")
+    shutil.copy("./dork/saves/devon.yml", tmp_path / "devon.yml")
+    convert.convert(str(tmp_path / "devon.yml"))
+
+    index = saves.SaveIndex(str(tmp_path))
+    assert index.rebuild() == 2
+    assert index.lookup("devon")["format"] == "binary"
+    assert index.lookup("dev")["rooms"] == index.lookup("devon")["rooms"]
+
+
+def _contents(data):
+    """every room's items and players, with item templates resolved"""
+
+    game = types.Gamebuilder.make_game(data)
+    return {
+        name: (
+            {key: item.record() for key, item in room.inventory.items()},
+            {
+                key: {k: v.record() for k, v in player.inventory.items()}
+                for key, player in room.players.items()
+            }
+        ) for name, room in game.rooms.items()
+    }
+
+
+def test_lazy_rooms():
+    """a lazy game only builds the rooms the hero reaches"""
+
+    game = types.Gamebuilder.build(
+        "lazy", seed=5, options={"save_format": "binary"}
+    )
+    game._save_game()
+
+    eager = types.Gamebuilder.build("lazy")
+    lazy = types.Gamebuilder.build("lazy", options={"lazy": True})
+    assert isinstance(lazy.rooms, types.LazyRooms)
+    assert isinstance(lazy.rooms.records, saves.RoomRecords)
+    assert len(lazy.rooms.built) <= 5 < len(lazy.rooms)
+    assert lazy.hero.location.name == eager.hero.location.name
+
+    for cmd in ["take", "north", "east", "take", "south", "west", "take"]:
+        assert repl._evaluate(cmd, lazy) == repl._evaluate(cmd, eager)
+    assert len(lazy.rooms.built) < len(lazy.rooms)
+
+    for loaded in [eager, lazy]:
+        loaded._save_game()
+        assert _contents(types.Gamebuilder.load_game("lazy")) == _contents(
+            types.Gamebuilder.save_data(eager)
+        )
+
+
+def test_yaml_header_skips_the_body(save_dir, mocker):
+    """a yaml save's header is read without parsing the rest of it"""
+
+    game = types.Gamebuilder.build("heady", seed=3)
+    game._save_game()
+    path = str(save_dir / "heady.yml")
+    with open(path, "a", encoding="utf-8") as save_file:
+        save_file.write("rooms: [unclosed\n")
+
+    load = mocker.spy(saves.YamlBackend, "load")
+    head = saves.build("yaml").header(path)
+    assert head["rooms"] == len(game.rooms)
+    assert not load.called
+
+
+def test_save_index_reads_create_nothing(save_dir):
+    """looking saves up in an empty directory leaves no index behind"""
+
+    index = saves.SaveIndex(str(save_dir))
+    assert index.lookup("nobody") is None
+    assert index.listing() == []
+    index.forget("nobody")
+    assert types.Game._list_saves()[0] == "There are no saved games."
+    assert not os.listdir(save_dir)
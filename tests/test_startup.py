@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Import-time budget tests for starting dork"""
+
+
+import os
+import subprocess
+import sys
+
+
+#  cumulative microseconds allowed for a cold `import dork.cli`
+STARTUP_BUDGET_US = 250000
+HEAVY_MODULES = ["matplotlib", "numpy", "yaml"]
+
+
+def _importtime(module):
+    """Run a fresh interpreter with -X importtime and parse its report"""
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=root, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def test_cli_skips_heavy_imports():
+    """matplotlib, numpy and yaml should only load on first use"""
+
+    timings = _importtime("dork.cli")
+    assert "dork.cli" in timings
+    for name in timings:
+        assert name.split(".")[0] not in HEAVY_MODULES, \
+            f"{name} was imported at startup"
+
+
+def test_cli_startup_budget():
+    """a cold import of dork.cli should stay within its time budget"""
+
+    timings = _importtime("dork.cli")
+    assert timings["dork.cli"] < STARTUP_BUDGET_US, \
+        f"dork.cli took {timings['dork.cli']}us to import"
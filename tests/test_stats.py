@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Tests for per-command latency stats"""
+
+
+import json
+import pstats
+from dork import repl, types
+from dork.game_utils.stats import CommandStats
+# pylint: disable=protected-access
+
+
+def test_stats_off_by_default(game):
+    """without stats commands are not timed and .stats says so"""
+
+    assert game.stats is None
+    assert "off" in repl._evaluate(".stats", game)[0]
+
+
+def test_histograms():
+    """times land in power-of-two buckets with bounded percentiles"""
+
+    stats = CommandStats()
+    for elapsed in [100, 1500, 1500, 3000, 10**12]:
+        stats.record("_look", elapsed)
+    entry = stats.handlers["_look"]
+    assert entry["count"] == 5
+    assert entry["buckets"][0] == 1
+    assert entry["buckets"][1] == 2
+    assert entry["buckets"][-1] == 1
+    assert stats.percentile("_look", 50) == 2048
+    assert stats.percentile("_look", 100) == 10**12
+
+
+def test_stats_and_slowest_profiles(tmp_path):
+    """handlers are timed, the slowest profiled and all dumped at exit"""
+
+    path = str(tmp_path / "stats.json")
+    game = types.Gamebuilder.build(
+        "timed", seed=2, options={"stats": path, "profile": 2}
+    )
+    for cmd in ["look", "i", "look", "take", "examine", "dance"]:
+        repl._evaluate(cmd, game)
+
+    report = repl._evaluate(".stats", game)[0]
+    assert "_look" in report and "_take_item" in report
+    assert game.stats.handlers["_look"]["count"] == 2
+    assert len(game.stats.slowest) == 2
+    game.close()
+
+    with open(path, encoding="utf-8") as stream:
+        dumped = json.load(stream)
+    assert dumped["handlers"]["_inventory"]["count"] == 1
+    assert len(dumped["slowest"]) == 2
+    assert pstats.Stats(dumped["slowest"][0]["profile"]).total_calls
@@ -2,8 +2,10 @@
 """Basic tests for state and entity relationships in dork"""
 
 
+import gc
 import dork.types as types
 import dork.game_utils.factory_data as factory_data
+from dork.game_utils import seeding
 # pylint: disable=protected-access
 
 
@@ -58,3 +60,190 @@ def test_mazefactory():
     assert isinstance(factory_data.rules(0, 0), list)
     assert isinstance(factory_data.stats("magic"), dict)
     assert isinstance(types.MazeFactory.build(), dict)
+
+
+def test_mazefactory_sizes():
+    """mazes can be built at any size, rounded up to keep the outer wall"""
+
+    data = types.MazeFactory.build(40, 30)
+    assert len(data["maze"]) == 31
+    assert len(data["maze"][0]) == 41
+
+    data = types.MazeFactory.build(width=9)
+    assert len(data["maze"]) == len(data["maze"][0]) == 11
+
+    data = types.MazeFactory.build(height=11)
+    assert len(data["maze"]) == len(data["maze"][0]) == 13
+
+    data = types.MazeFactory.build(height=10)
+    assert len(data["maze"]) == len(data["maze"][0]) == 11
+
+    data = types.MazeFactory.build(seed=4)
+    height = len(data["maze"]) - 1
+    assert height in types.MazeFactory.sizes
+    assert len(data["maze"][0]) - 1 == 148//height + 148//height % 2
+
+
+def test_mazefactory_carve_is_perfect():
+    """every cell is carved exactly once and joined by a single wall"""
+
+    maze, path = types.MazeFactory.carve(60, 40)
+    cells = 30*20
+    assert len(path) == cells
+    assert len(set(map(tuple, path.tolist()))) == cells
+    assert (maze == types.MazeFactory.path_color).sum() == 2*cells - 1
+    assert (maze[0] == types.MazeFactory.wall_color).all()
+    assert (maze[:, -1] == types.MazeFactory.wall_color).all()
+
+
+def test_gamebuilder_size():
+    """new games take their maze size from Gamebuilder.build"""
+
+    big = types.Gamebuilder.build("sizer", width=50, height=20)
+    assert len(big.maze) == 21
+    assert len(big.maze[0]) == 51
+
+
+def test_find_rooms_matches_rules():
+    """the neighbor-code lookup agrees with factory_data.rules"""
+
+    maze, path = types.MazeFactory.carve(30, 30)
+    expected = []
+    for i, j in map(tuple, path.tolist()):
+        neighbors = [maze[i-1, j], maze[i+1, j], maze[i, j-1], maze[i, j+1]]
+        if neighbors in types.MazeFactory.rules:
+            expected.append((i, j))
+
+    assert types.MazeFactory.find_rooms(maze, path) == expected
+    for room in expected:
+        assert maze[room] == types.MazeFactory.room_color
+
+
+def test_roomfactory_adjacency():
+    """neighbors are symmetric and corridor lengths match coordinates"""
+
+    opposite = {
+        "north": "south", "south": "north", "east": "west", "west": "east"
+    }
+    rooms = types.MazeFactory.build(30, 30)["rooms"]
+
+    for name, room in rooms.items():
+        for direction, neighbor in room["adjacent"].items():
+            if neighbor is None:
+                assert room["corridors"][direction] is None
+                continue
+            other = rooms[neighbor]
+            assert other["adjacent"][opposite[direction]] == name
+            assert room["corridors"][direction] == (
+                abs(room["coordinates"]["x"] - other["coordinates"]["x"]) +
+                abs(room["coordinates"]["y"] - other["coordinates"]["y"])
+            )
+
+
+def test_seeded_worlds_repeat():
+    """the same seed builds the same world, other seeds do not"""
+
+    first = types.MazeFactory.build(30, 30, seed=1234)
+    again = types.MazeFactory.build(30, 30, seed=1234)
+    other = types.MazeFactory.build(30, 30, seed=4321)
+
+    assert first == again
+    assert first != other
+    assert types.MazeFactory.build(seed=99) == types.MazeFactory.build(seed=99)
+
+
+def test_room_chunks_are_order_independent():
+    """each chunk of rooms only depends on the seed and its index"""
+
+    seeds = seeding.Seeds(2019)
+    maze, path = types.MazeFactory.carve(80, 80, seeds.stream("maze"))
+    rooms = types.MazeFactory.find_rooms(maze, path)
+    assert len(rooms) > 2*seeding.CHUNK
+
+    types.RoomFactory.build(maze, rooms, seeds)
+    forward = [types.RoomFactory._make_chunk(i) for i in range(3)]
+    backward = [types.RoomFactory._make_chunk(i) for i in reversed(range(3))]
+    assert forward == backward[::-1]
+
+
+def test_game_objects_are_slotted(player, item, room, holder):
+    """game objects carry no __dict__ and attrs() lists their fields"""
+
+    for obj in [player, item, room, holder]:
+        assert not hasattr(obj, "__dict__")
+
+    assert set(types.attrs(room)) == {
+        "inventory", "north", "south", "east", "west", "x", "y",
+        "name", "description", "corridors", "players"
+    }
+    assert types.attrs(item)["type"] is None
+    assert types.Adjacent().fields == ("north", "south", "east", "west")
+    assert types.Coord().fields == ("x", "y")
+
+
+def test_items_share_templates():
+    """items of one type and fixed stats share a single template"""
+
+    first = types.Item.from_record(
+        type="armor", description="", attack=None, strength=12, weight=20,
+        luck=1, equipable=True, amount=1
+    )
+    second = types.Item.from_record(
+        type="armor", description="", stats={
+            "attack": None, "strength": 30, "weight": 15, "luck": -7,
+            "equipable": True, "amount": 1
+        }
+    )
+    assert first.template is second.template
+    assert first.strength == 12 and second.strength == 30
+    assert first.record()["attack"] is None
+    assert types.Item.from_record(**first.record()).record() == first.record()
+
+
+def test_items_out_of_range_stats_are_kept():
+    """stats outside their rolled range are fixed on a template"""
+
+    item = types.Item.from_record(
+        type="armor", description="", attack=None, strength=10**6,
+        weight=20, luck=1, equipable=True, amount=1
+    )
+    assert item.strength == 10**6
+    assert item.template.fixed["strength"] == 10**6
+
+
+def test_save_game_writes_templates(game):
+    """saved items reference a template table and reload unchanged"""
+
+    data = types.Gamebuilder.save_data(game)
+    items = [
+        item for room in data["rooms"].values()
+        for item in room["inventory"].values()
+    ]
+    assert items and all("template" in item for item in items)
+    assert "type" not in items[0]
+
+    types.Gamebuilder.templates = types.Gamebuilder._load_templates(
+        data["templates"]
+    )
+    for room in game.rooms.values():
+        for name, item in room.inventory.items():
+            saved = data["rooms"][room.name]["inventory"][name]
+            loaded = types.Gamebuilder._rec_inst(types.Item, **saved)
+            assert loaded.record() == item.record()
+
+
+def test_games_keep_their_own_players():
+    """heroes are found by name in their own game, and games are freed"""
+
+    first = types.Gamebuilder.build("twin", seed=1)
+    second = types.Gamebuilder.build("twin", seed=2)
+    assert first.players["twin"] is first.hero
+    assert second.players["twin"] is second.hero
+    assert first.hero is not second.hero
+
+    gc.collect()
+    alive = len(types.Player.instances), len(types.Room.instances)
+    del first, second
+    gc.collect()
+    assert len(types.Player.instances) < alive[0]
+    assert len(types.Room.instances) < alive[1]
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""Tests for pre-generated world pools"""
+
+
+import os
+from dork import types
+from dork.game_utils import saves, world_pool
+
+
+def test_pool_hands_over_worlds():
+    """worlds come out of the pool and are replaced in the background"""
+
+    pool = world_pool.WorldPool(size=2, width=20, height=10).start()
+    try:
+        data = pool.take()
+        assert len(data["maze"]) == 11
+        assert "room 0" in data["rooms"]
+        assert len(pool.ready) == 2
+
+        game = types.Gamebuilder.build("pooler", options={"pool": pool})
+        assert len(game.maze[0]) == 21
+        assert game.hero.location is game.rooms["room 0"]
+    finally:
+        pool.close()
+
+
+def test_pool_without_worker():
+    """a pool which was never started still builds worlds"""
+
+    pool = world_pool.WorldPool(width=12, height=12)
+    assert len(pool.take()["maze"]) == 13
+
+
+def test_disk_pool(tmp_path):
+    """on-disk worlds are claimed first and restocked by the worker"""
+
+    directory = str(tmp_path)
+    stocked = world_pool.stock(directory, 2, width=16, height=16)
+    assert len(stocked) == 2
+    assert len(saves.build("yaml").load(stocked[0])["maze"]) == 17
+
+    pool = world_pool.WorldPool(size=0, directory=directory).start()
+    data = pool.take()
+    assert len(data["maze"]) == 17
+    pool.executor.shutdown(wait=True)
+    pool.close()
+
+    assert len([
+        name for name in os.listdir(directory) if name.endswith(".world")
+    ]) == 2